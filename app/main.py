@@ -1,23 +1,58 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, RedirectResponse, Response
 
 from .services.content import Page, Post, get_page, get_post_by_slug, list_posts
+from .services.marimo_proxy import close_marimo_client
 from .services.rss import render_rss
 from .services.seo import render_llms_txt, render_robots_txt, render_sitemap_xml
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Parse every post and build the feed up front so first requests hit warm caches. Warming
+    # is only an optimisation: a bad post must not keep /healthz and the site from starting.
+    try:
+        list_posts(include_drafts=True)
+        _refresh_rss_cache()
+    except Exception:
+        logger.exception("Cache warm-up failed; caches will be built on first request")
+    yield
+    await close_marimo_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 STATIC_DIR = REPO_ROOT / "app" / "static"
 FRONTEND_DIST_DIR = REPO_ROOT / "frontend" / "out"
 COURSEWORK_PATH = STATIC_DIR / "courses.json"
 
+# Encoded /api/posts/{slug} bodies; reused while get_post_by_slug returns the same cached Post.
+_POST_PAYLOAD_CACHE: dict[str, tuple[Post, bytes]] = {}
+
+
+@dataclass
+class _RssCache:
+    xml: str = ""
+    body: bytes = b""
+    etag: str = ""
+
+
+_rss_cache = _RssCache()
+
 
 @app.get("/healthz")
 def healthz() -> dict[str, str]:
@@ -45,6 +80,10 @@ def _serialize_post(post: Post) -> dict[str, Any]:
     return payload
 
 
+def _json_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def _serialize_page(page: Page) -> dict[str, Any]:
     return {
         "slug": page.slug,
@@ -94,11 +133,15 @@ def api_list_posts() -> list[dict[str, Any]]:
 
 
 @app.get("/api/posts/{slug}")
-def api_post_by_slug(slug: str) -> dict[str, Any]:
+def api_post_by_slug(slug: str) -> Response:
     post = get_post_by_slug(slug)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _serialize_post(post)
+    cached = _POST_PAYLOAD_CACHE.get(slug)
+    if cached is None or cached[0] is not post:
+        cached = (post, _json_bytes(_serialize_post(post)))
+        _POST_PAYLOAD_CACHE[slug] = cached
+    return Response(content=cached[1], media_type="application/json")
 
 
 @app.get("/api/page/{slug}")
@@ -120,10 +163,29 @@ def api_coursework() -> dict[str, Any]:
     return raw
 
 
-@app.get("/feed.xml")
-def feed() -> Response:
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return any(tag in {etag, "*"} for tag in candidates)
+
+
+def _refresh_rss_cache() -> None:
     xml = render_rss()
-    return Response(content=xml, media_type="application/rss+xml")
+    if xml is not _rss_cache.xml:
+        body = xml.encode("utf-8")
+        _rss_cache.body = body
+        _rss_cache.etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        _rss_cache.xml = xml
+
+
+@app.get("/feed.xml")
+def feed(request: Request) -> Response:
+    _refresh_rss_cache()
+    headers = {"ETag": _rss_cache.etag}
+    if _etag_matches(request.headers.get("if-none-match"), _rss_cache.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=_rss_cache.body, media_type="application/rss+xml", headers=headers)
 
 
 @app.get("/robots.txt")
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import os
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from html import escape
+from itertools import groupby
 from pathlib import Path
 from typing import Any, Iterable
 
 import frontmatter  # type: ignore[import-untyped]
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 
 
 try:
@@ -13,12 +24,18 @@ try:
 except Exception:  # pragma: no cover
     MarkdownIt = None  # type: ignore[assignment]
 
+# Optional Rust port of markdown-it; same CommonMark output, much faster rendering.
+try:
+    import markdown_it_pyrs
+except Exception:  # pragma: no cover
+    markdown_it_pyrs = None  # type: ignore[assignment]
+
 
 CONTENT_DIR = Path("content/posts")
 PAGES_DIR = Path("content/pages")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Post:
     title: str
     slug: str
@@ -33,6 +50,9 @@ class Post:
     content: str
     seo_title: str | None = field(default=None, init=False)
     seo_description: str | None = field(default=None, init=False)
+    og_image: str | None = field(default=None, init=False)
+    _html: str | None = field(default=None, init=False, repr=False, compare=False)
+    _tags_html: str | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def draft(self) -> bool:
@@ -52,19 +72,45 @@ class Post:
 
     @property
     def html(self) -> str:
-        return _render_markdown(self.content)
+        # Rendered lazily once per (cached) Post; frozen, so bypass __setattr__.
+        html = self._html
+        if html is None:
+            html = _render_markdown(self.content)
+            object.__setattr__(self, "_html", html)
+        return html
+
+    @property
+    def tags_html(self) -> str:
+        """``<p class="post-tags">`` markup for the tags, built once per (cached) Post."""
+        tags_html = self._tags_html
+        if tags_html is None:
+            tags_html = ""
+            if self.tags:
+                spans = " ".join([f"<span>#{escape(tag)}</span>" for tag in self.tags])
+                tags_html = f'<p class="post-tags">{spans}</p>'
+            object.__setattr__(self, "_tags_html", tags_html)
+        return tags_html
 
     @property
     def canonical_path_or_default(self) -> str:
         return self.canonical_path or f"/blog/{self.slug}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Page:
     title: str
     slug: str
     meta: dict[str, object]
     content: str
+    _meta_escaped: dict[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _quotes_escaped: list[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _links_prebuilt: list[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def html(self) -> str:
@@ -99,6 +145,57 @@ class Page:
         image = self.meta.get("og_image")
         return image if isinstance(image, str) and image.strip() else None
 
+    @property
+    def canonical_path(self) -> str | None:
+        path = self.meta.get("canonical_path")
+        return path if isinstance(path, str) and path.strip() else None
+
+    @property
+    def meta_escaped(self) -> dict[str, str]:
+        """HTML-escaped ``str()`` of each truthy ``meta`` value, built once per (cached) Page."""
+        escaped = self._meta_escaped
+        if escaped is None:
+            # str() rather than a type filter, so YAML dates and the like still render.
+            escaped = {key: escape(str(value)) for key, value in self.meta.items() if value}
+            object.__setattr__(self, "_meta_escaped", escaped)
+        return escaped
+
+    @property
+    def quotes_escaped(self) -> list[str]:
+        escaped = self._quotes_escaped
+        if escaped is None:
+            escaped = [escape(quote) for quote in self.quotes]
+            object.__setattr__(self, "_quotes_escaped", escaped)
+        return escaped
+
+    @property
+    def links_prebuilt(self) -> list[str]:
+        """``<li>`` markup for each well-formed entry in ``meta["links"]``, built once."""
+        items = self._links_prebuilt
+        if items is None:
+            items = []
+            links = self.meta.get("links")
+            if isinstance(links, list):
+                for item in links:
+                    if not isinstance(item, dict):
+                        continue
+                    label = item.get("label") or item.get("name") or item.get("title")
+                    url = item.get("url")
+                    note = item.get("note") or item.get("description")
+                    if not label or not url:
+                        continue
+                    note_span = (
+                        f'<span class="about-link-note">{escape(str(note))}</span>'
+                        if note
+                        else ""
+                    )
+                    items.append(
+                        f'<li><a href="{escape(str(url), quote=True)}">'
+                        f"{escape(str(label))}</a>{note_span}</li>"
+                    )
+            object.__setattr__(self, "_links_prebuilt", items)
+        return items
+
 
 @dataclass
 class _RenderCache:
@@ -107,10 +204,32 @@ class _RenderCache:
 
 _render_cache = _RenderCache()
 
+# Parsed posts keyed by path; entries are reused while (st_mtime_ns, st_size) match.
+_POST_CACHE: dict[Path, tuple[int, int, Post]] = {}
+_PAGE_CACHE: dict[Path, tuple[int, int, Page]] = {}
+
+
+@dataclass
+class _PostIndex:
+    dir_mtime_ns: int = -1
+    paths: list[Path] = field(default_factory=list)
+    loaded: list[Post] = field(default_factory=list)
+    posts: list[Post] = field(default_factory=list)
+    version: int = 0
+
+
+_post_index = _PostIndex()
+
 
 def _md_renderer() -> Any | None:
     if _render_cache.markdown is not None:
         return _render_cache.markdown
+    if markdown_it_pyrs is not None:
+        try:
+            _render_cache.markdown = markdown_it_pyrs.MarkdownIt("commonmark")
+            return _render_cache.markdown
+        except Exception:
+            pass
     if MarkdownIt is None:
         return None
     try:
@@ -130,6 +249,7 @@ def _render_markdown(value: str) -> str:
         return value
 
 
+@lru_cache(maxsize=1)
 def syntax_highlight_css() -> str:
     try:
         from pygments.formatters import HtmlFormatter
@@ -139,14 +259,39 @@ def syntax_highlight_css() -> str:
         return ""
 
 
+# python-frontmatter's YAML delimiter: a line of three or more dashes, trailing space allowed.
+_FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+
+def _read_frontmatter(path: Path) -> tuple[dict[str, Any], str]:
+    # Fast path for the "---" YAML header every content file uses, split exactly the way
+    # python-frontmatter does; anything else (TOML/JSON headers, non-mapping YAML) goes
+    # through python-frontmatter itself.
+    text = path.read_bytes().decode("utf-8").strip()
+    if _FM_BOUNDARY.match(text):
+        parts = _FM_BOUNDARY.split(text, 2)
+        if len(parts) == 3:
+            metadata = yaml.load(parts[1], Loader=_YamlLoader)
+            if isinstance(metadata, dict):
+                return metadata, parts[2].strip()
+    parsed = frontmatter.load(path)
+    return dict(parsed.metadata), parsed.content
+
+
 def _parse_date(value: object) -> datetime | None:
-    if value is None:
-        return None
     if isinstance(value, datetime):
         return value
+    if value is None:
+        return None
+    if isinstance(value, date):
+        # YAML parses bare "2024-01-01" values to date objects.
+        return datetime(value.year, value.month, value.day)
+    text = str(value)
+    if len(text) < 8:
+        return None
     try:
-        return datetime.fromisoformat(str(value))
-    except Exception:
+        return datetime.fromisoformat(text)
+    except ValueError:
         return None
 
 
@@ -174,24 +319,43 @@ def _normalize_status(raw: object, *, draft: object | None) -> str:
     return "published"
 
 
+def reload_posts() -> None:
+    _POST_CACHE.clear()
+    _PAGE_CACHE.clear()
+    _post_index.dir_mtime_ns = -1
+
+
 def _load_post(path: Path) -> Post | None:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _POST_CACHE.pop(path, None)
         return None
 
-    parsed = frontmatter.load(path)
-    slug = _slugify(parsed.metadata.get("slug"), path.parent.name)
-    title = _slugify(parsed.metadata.get("title"), slug)
-    date = _parse_date(parsed.metadata.get("date")) or datetime.fromtimestamp(path.stat().st_mtime)
-    summary = parsed.metadata.get("summary")
+    cached = _POST_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    post = _parse_post(path, stat.st_mtime)
+    _POST_CACHE[path] = (stat.st_mtime_ns, stat.st_size, post)
+    return post
+
+
+def _parse_post(path: Path, mtime: float) -> Post:
+    metadata, body = _read_frontmatter(path)
+    slug = _slugify(metadata.get("slug"), path.parent.name)
+    title = _slugify(metadata.get("title"), slug)
+    date = _parse_date(metadata.get("date")) or datetime.fromtimestamp(mtime)
+    summary = metadata.get("summary")
     summary_text = str(summary) if summary is not None else None
-    tags = _string_list(parsed.metadata.get("tags"))
-    status = _normalize_status(parsed.metadata.get("status"), draft=parsed.metadata.get("draft"))
-    updated = _parse_date(parsed.metadata.get("updated"))
-    hero = parsed.metadata.get("hero")
+    tags = _string_list(metadata.get("tags"))
+    status = _normalize_status(metadata.get("status"), draft=metadata.get("draft"))
+    updated = _parse_date(metadata.get("updated"))
+    hero = metadata.get("hero")
     hero_text = str(hero) if hero is not None else None
-    series = parsed.metadata.get("series")
+    series = metadata.get("series")
     series_text = str(series) if series is not None else None
-    canonical = parsed.metadata.get("canonical_path")
+    canonical = metadata.get("canonical_path")
     canonical_path = str(canonical) if isinstance(canonical, str) else None
 
     return Post(
@@ -205,31 +369,65 @@ def _load_post(path: Path) -> Post | None:
         hero=hero_text,
         series=series_text,
         canonical_path=canonical_path,
-        content=parsed.content.strip("\n") + "\n",
+        content=body.strip("\n") + "\n",
     )
 
 
-def list_posts(limit: int | None = None, include_drafts: bool = False) -> list[Post]:
-    posts: list[Post] = []
-    if not CONTENT_DIR.exists():
-        return posts
+def _post_paths() -> list[Path]:
+    try:
+        dir_mtime_ns = os.stat(CONTENT_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if dir_mtime_ns != _post_index.dir_mtime_ns:
+        with os.scandir(CONTENT_DIR) as entries:
+            names = sorted(entry.name for entry in entries if entry.is_dir())
+        _post_index.paths = [CONTENT_DIR / name / "index.md" for name in names]
+        _post_index.dir_mtime_ns = dir_mtime_ns
+    return _post_index.paths
+
 
-    post_dirs = sorted([p for p in CONTENT_DIR.iterdir() if p.is_dir() and (p / "index.md").exists()], key=lambda item: item.name)
-    for item in post_dirs:
-        post = _load_post(item / "index.md")
-        if post is None:
-            continue
-        if not include_drafts and post.status == "draft":
-            continue
-        posts.append(post)
+def _sorted_posts() -> list[Post]:
+    # Adding or removing a post directory bumps the directory mtime; edits to an existing
+    # post only show up as a new Post object from _load_post, so compare identities too.
+    loaded = [post for post in map(_load_post, _post_paths()) if post is not None]
+    cached = _post_index.loaded
+    if len(loaded) != len(cached) or any(a is not b for a, b in zip(loaded, cached, strict=True)):
+        _post_index.loaded = loaded
+        _post_index.posts = sorted(loaded, key=lambda post: post.date, reverse=True)
+        _post_index.version += 1
+    return _post_index.posts
 
-    posts.sort(key=lambda post: post.date, reverse=True)
+
+def posts_version() -> int:
+    """Counter that changes whenever the set or content of posts changes."""
+    _sorted_posts()
+    return _post_index.version
+
+
+def list_posts(limit: int | None = None, include_drafts: bool = False) -> list[Post]:
+    posts = _sorted_posts()
+    if not include_drafts:
+        posts = [post for post in posts if post.status != "draft"]
+    else:
+        posts = list(posts)
 
     if limit is not None and limit > 0:
         return posts[:limit]
     return posts
 
 
+@lru_cache(maxsize=1)
+def _posts_by_year(version: int) -> list[tuple[int, list[Post]]]:
+    # Keyed on posts_version(); list_posts() is newest-first, so one groupby pass suffices.
+    grouped = groupby(list_posts(), key=lambda post: post.date.year)
+    return [(year, list(group)) for year, group in grouped]
+
+
+def list_posts_by_year() -> list[tuple[int, list[Post]]]:
+    """Published posts grouped by year, cached until the post index changes."""
+    return _posts_by_year(posts_version())
+
+
 def get_post_by_slug(slug: str) -> Post | None:
     path = CONTENT_DIR / slug / "index.md"
     post = _load_post(path)
@@ -247,14 +445,23 @@ def get_post_by_slug_including_drafts(slug: str) -> Post | None:
 
 def get_page(slug: str) -> Page | None:
     path = PAGES_DIR / f"{slug}.md"
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _PAGE_CACHE.pop(path, None)
         return None
 
-    parsed = frontmatter.load(path)
-    title = _slugify(parsed.metadata.get("title"), slug)
-    return Page(
+    cached = _PAGE_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    metadata, body = _read_frontmatter(path)
+    title = _slugify(metadata.get("title"), slug)
+    page = Page(
         title=title,
         slug=slug,
-        meta=dict(parsed.metadata),
-        content=parsed.content.strip("\n") + "\n",
+        meta=metadata,
+        content=body.strip("\n") + "\n",
     )
+    _PAGE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, page)
+    return page
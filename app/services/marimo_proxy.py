@@ -1,21 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import json
 import os
 import re
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable, Mapping
+from functools import cache, lru_cache
 from html import escape as html_escape, unescape as html_unescape
+from typing import Any
+from urllib.parse import quote
 
 import httpx
+import orjson
 from fastapi import Request, WebSocket
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import Response, StreamingResponse
 
 logger = logging.getLogger(__name__)
 
 try:
+    import websockets
     from websockets.typing import Subprotocol
 except Exception:  # pragma: no cover
+    websockets = None  # type: ignore[assignment]
     Subprotocol = str  # type: ignore[assignment,misc]
 
 MARIMO_SEMANTIC_ENTROPY_MOUNT = "/marimo/semantic-entropy-probe-comparison"
@@ -23,46 +29,151 @@ MARIMO_SEMANTIC_ENTROPY_BASE_URL_ENV = "MARIMO_SEMANTIC_ENTROPY_BASE_URL"
 _DEFAULT_BASE_URL = "http://semantic-entropy-probe-comparison.railway.internal"
 
 
-_HOP_BY_HOP_HEADERS = {
-    "connection",
-    "keep-alive",
-    "proxy-authenticate",
-    "proxy-authorization",
-    "te",
-    "trailers",
-    "transfer-encoding",
-    "upgrade",
-}
+_HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
 
-_DROP_RESPONSE_HEADERS = {
-    *_HOP_BY_HOP_HEADERS,
-    "content-length",
-    "content-encoding",
+_DROP_REQUEST_HEADERS = _HOP_BY_HOP_HEADERS | {"host", "content-length"}
+
+# Streamed responses forward the raw upstream bytes, so framing/encoding headers stay valid.
+_DROP_STREAMED_RESPONSE_HEADERS = _HOP_BY_HOP_HEADERS | {
     "x-frame-options",
     "content-security-policy",
 }
 
-_REWRITE_ATTR_RE = re.compile(r'(?P<attr>\b(?:href|src|action)=["\'])/(?!/)(?P<rest>[^"\']*)')
-_HEAD_TAG_RE = re.compile(r"(?i)<head(\s[^>]*)?>")
-_MARIMO_USER_CONFIG_RE = re.compile(
-    r'(?is)(<marimo-user-config[^>]*\bdata-config=")(?P<cfg>[^"]*)(")'
+_DROP_RESPONSE_HEADERS = _DROP_STREAMED_RESPONSE_HEADERS | {"content-length", "content-encoding"}
+
+_BASE_TAG_RE = re.compile(rb"(?i)<base\b")
+# Cheap pre-scan on the raw body: if none of the rewrite targets appear, skip decode/encode.
+_BYTES_MARKER_RE = re.compile(
+    rb"(?i:<head|<marimo-user-config|__marimo_mount_config__)|\b(?:href|src|action)=[\"']/(?!/)"
 )
-_MARIMO_MOUNT_CONFIG_RE = re.compile(
-    r"(?is)(window\.__MARIMO_MOUNT_CONFIG__\s*=\s*\{)(?P<body>.*?)(\}\s*;)"
+# All rewrite patterns are bytes: every target is ASCII, so the body never needs transcoding.
+_MARIMO_THEME_KEY_RE = re.compile(rb'("theme"\s*:\s*")[^"]+(")')
+_HEAD_ALT = rb"(?P<head>(?i:<head(?:\s[^>]*)?>))"
+# Same case-insensitive markers the theme patterns below match.
+_THEME_MARKER_RE = re.compile(rb"(?i)__marimo_mount_config__|marimo-user-config")
+_MOUNT_ALT = rb"(?P<mount>(?is:window\.__MARIMO_MOUNT_CONFIG__\s*=\s*\{.*?\}\s*;))"
+_UCFG_ALT = rb'(?P<ucfg>(?is:<marimo-user-config[^>]*\bdata-config="))(?P<cfg>[^"]*)"'
+
+
+@lru_cache(maxsize=8)
+def _mount_bits(
+    mount: str,
+) -> tuple[bytes, re.Pattern[bytes], re.Pattern[bytes], re.Pattern[bytes]]:
+    """Return ``(base_href, rewrite_re, urls_re, attr_re)`` specialised for ``mount``.
+
+    The attribute alternative only matches root-relative URLs that are not already under the
+    mount, so every attribute match is rewritten without further checks.
+    """
+    base_href = (mount.rstrip("/") + "/").encode("utf-8")
+    prefix = re.escape(mount.lstrip("/").encode("utf-8"))
+    attr_alt = (
+        rb'(?P<attr>\b(?:href|src|action)=["\'])/(?!/)'
+        rb"(?!" + prefix + rb'(?:[/"\']|\Z))(?P<rest>[^"\']*)'
+    )
+    # One scan over the document: the first <head> (for <base> injection), the marimo mount
+    # config script, the <marimo-user-config> element, and root-relative attributes.
+    rewrite_re = re.compile(b"|".join((_HEAD_ALT, _MOUNT_ALT, _UCFG_ALT, attr_alt)))
+    # Used when no theme override applies or the body has no marimo config markers.
+    urls_re = re.compile(_HEAD_ALT + b"|" + attr_alt)
+    return base_href, rewrite_re, urls_re, re.compile(attr_alt)
+
+
+# Static parts of the 502 page; only the base URL and the error text vary.
+_ERR_PREFIX = (
+    b'<!doctype html><html><head><meta charset="utf-8" />'
+    b'<meta name="viewport" content="width=device-width, initial-scale=1" />'
+    b"<title>Embed unavailable</title></head><body>"
+    b"<h1>Embed unavailable</h1>"
+    b"<p>The Marimo service could not be reached from this server.</p>"
+    b"<p><code>"
 )
+_ERR_MID = (
+    b"</code></p><p>For local dev, set <code>"
+    + html_escape(MARIMO_SEMANTIC_ENTROPY_BASE_URL_ENV).encode()
+    + b"</code> to a reachable URL.</p><pre>"
+)
+_ERR_SUFFIX = b"</pre></body></html>"
+
+_SMALL_BODY_LIMIT = 64 * 1024
+
+_WS_MAX_QUEUE = 128
+_WS_WRITE_LIMIT = 2**20
+
+# Shared upstream client so proxied requests reuse pooled keep-alive connections. The upstream
+# is a plain-http internal service, so HTTP/1.1 keep-alive is what actually gets reused.
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            follow_redirects=False,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=100,
+                keepalive_expiry=30.0,
+            ),
+            http2=False,
+        )
+    return _client
+
 
+async def close_marimo_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
+
+@cache
 def _marimo_base_url() -> str:
+    # Read once per process; call _marimo_base_url.cache_clear() after changing the env var.
     return os.getenv(MARIMO_SEMANTIC_ENTROPY_BASE_URL_ENV, _DEFAULT_BASE_URL).strip()
 
 
+@lru_cache(maxsize=2)
+def _ws_base(base: str) -> str:
+    if base.startswith("https://"):
+        return "wss://" + base.removeprefix("https://").lstrip("/")
+    if base.startswith("http://"):
+        return "ws://" + base.removeprefix("http://").lstrip("/")
+    return base
+
+
+@lru_cache(maxsize=2)
+def _normalized_base(base: str) -> str:
+    return base.rstrip("/") + "/"
+
+
 def _join_url(base: str, path: str, query: str) -> str:
-    base_norm = base.rstrip("/") + "/"
-    path_norm = path.lstrip("/")
-    url = base_norm + path_norm
-    if query:
-        url += "?" + query
-    return url
+    url = _normalized_base(base) + path.lstrip("/")
+    return url + "?" + query if query else url
+
+
+# Printable ASCII other than space; every other byte is percent-encoded as-is.
+_QUERY_SAFE = "".join(map(chr, range(0x21, 0x7F)))
+
+
+def _scope_query(scope: Mapping[str, Any]) -> str:
+    # The raw ASGI query string; avoids building a starlette URL object per request.
+    raw = bytes(scope.get("query_string", b""))
+    if raw.isascii():
+        return raw.decode("ascii")
+    # Raw UTF-8 goes upstream as %XX escapes, matching what httpx does for str URLs.
+    return quote(raw, safe=_QUERY_SAFE)
 
 
 def _rewrite_location(location: str, mount: str) -> str:
@@ -74,67 +185,66 @@ def _rewrite_location(location: str, mount: str) -> str:
 
 
 def _rewrite_html(html_bytes: bytes, mount: str, *, theme: str | None = None) -> bytes:
-    try:
-        html = html_bytes.decode("utf-8")
-    except Exception:
-        html = html_bytes.decode("utf-8", errors="replace")
-
-    base_href = mount.rstrip("/") + "/"
-    mount_prefix = mount.lstrip("/")
-
-    if theme in {"dark", "light"}:
-        html = _rewrite_marimo_theme(html, theme=theme)
+    if _BYTES_MARKER_RE.search(html_bytes) is None:
+        return html_bytes
 
     # Ensure relative URLs resolve under the proxy mount.
-    if "<base" not in html.lower():
-        m = _HEAD_TAG_RE.search(html)
-        if m:
-            insert_at = m.end()
-            html = html[:insert_at] + f'\n<base href="{base_href}" />' + html[insert_at:]
+    needs_base = _BASE_TAG_RE.search(html_bytes) is None
+    needs_mount_theme = needs_user_theme = (
+        theme in {"dark", "light"} and _THEME_MARKER_RE.search(html_bytes) is not None
+    )
 
-    # Rewrite root-relative asset paths (e.g. src="/static/app.js") to stay under the mount.
-    def _rewrite_attr(match: re.Match[str]) -> str:
-        rest = match.group("rest")
-        if rest == mount_prefix or rest.startswith(mount_prefix + "/"):
-            return match.group(0)
-        return f'{match.group("attr")}{base_href}{rest}'
-
-    html = _REWRITE_ATTR_RE.sub(_rewrite_attr, html)
-    return html.encode("utf-8")
-
-
-def _rewrite_marimo_theme(html: str, *, theme: str) -> str:
-    html = _rewrite_marimo_mount_config_theme(html, theme=theme)
-    html = _rewrite_marimo_user_config_theme(html, theme=theme)
-    return html
+    base_href, rewrite_re, urls_re, attr_re = _mount_bits(mount)
+    pattern = rewrite_re if needs_mount_theme else urls_re
 
+    # Rewrite root-relative asset paths (e.g. src="/static/app.js") to stay under the mount.
+    def _rewrite_attr(match: re.Match[bytes]) -> bytes:
+        return match.group("attr") + base_href + match.group("rest")
+
+    def _rewrite(match: re.Match[bytes]) -> bytes:
+        nonlocal needs_base, needs_mount_theme, needs_user_theme
+        if match.group("attr") is not None:
+            return _rewrite_attr(match)
+        if match.group("head") is not None:
+            if not needs_base:
+                return match.group(0)
+            needs_base = False
+            return match.group(0) + b'\n<base href="' + base_href + b'" />'
 
-def _rewrite_marimo_mount_config_theme(html: str, *, theme: str) -> str:
-    def _replace(match: re.Match[str]) -> str:
         segment = match.group(0)
-        return re.sub(r'("theme"\s*:\s*")[^"]+(")', rf"\1{theme}\2", segment, count=1)
+        if match.group("mount") is not None:
+            if needs_mount_theme and theme is not None:
+                needs_mount_theme = False
+                segment = _rewrite_marimo_mount_config_theme(segment, theme=theme)
+        elif needs_user_theme and theme is not None:
+            needs_user_theme = False
+            segment = _rewrite_marimo_user_config_theme(match, theme=theme)
+        return attr_re.sub(_rewrite_attr, segment)
 
-    return _MARIMO_MOUNT_CONFIG_RE.sub(_replace, html, count=1)
+    return pattern.sub(_rewrite, html_bytes)
 
 
-def _rewrite_marimo_user_config_theme(html: str, *, theme: str) -> str:
-    def _replace(match: re.Match[str]) -> str:
-        raw_cfg = match.group("cfg")
-        try:
-            cfg_json = html_unescape(raw_cfg)
-            cfg = json.loads(cfg_json)
-            display = cfg.get("display")
-            if not isinstance(display, dict):
-                display = {}
-                cfg["display"] = display
-            display["theme"] = theme
-            new_cfg_json = json.dumps(cfg, ensure_ascii=False, separators=(",", ":"))
-            escaped_cfg = html_escape(new_cfg_json, quote=True)
-            return match.group(1) + escaped_cfg + match.group(3)
-        except Exception:
-            return match.group(0)
+def _rewrite_marimo_mount_config_theme(segment: bytes, *, theme: str) -> bytes:
+    return _MARIMO_THEME_KEY_RE.sub(
+        rb"\g<1>" + theme.encode("ascii") + rb"\g<2>", segment, count=1
+    )
 
-    return _MARIMO_USER_CONFIG_RE.sub(_replace, html, count=1)
+
+def _rewrite_marimo_user_config_theme(match: re.Match[bytes], *, theme: str) -> bytes:
+    raw_cfg = match.group("cfg")
+    try:
+        cfg_json = html_unescape(raw_cfg.decode("utf-8"))
+        cfg = orjson.loads(cfg_json)
+        display = cfg.get("display")
+        if not isinstance(display, dict):
+            display = {}
+            cfg["display"] = display
+        display["theme"] = theme
+        new_cfg_json = orjson.dumps(cfg).decode("utf-8")
+        escaped_cfg = html_escape(new_cfg_json, quote=True).encode("utf-8")
+        return match.group("ucfg") + escaped_cfg + b'"'
+    except Exception:
+        return match.group(0)
 
 
 def _append_vary(headers: dict[str, str], value: str) -> None:
@@ -157,92 +267,109 @@ def _append_vary(headers: dict[str, str], value: str) -> None:
     headers[existing_key] = existing_value + f", {value}"
 
 
-def _forward_request_headers(headers: Iterable[tuple[str, str]]) -> dict[str, str]:
-    forwarded: dict[str, str] = {}
-    for key, value in headers:
-        key_lower = key.lower()
-        if key_lower in _HOP_BY_HOP_HEADERS:
-            continue
-        if key_lower in {"host", "content-length"}:
-            continue
-        forwarded[key] = value
-    return forwarded
-
-
-def _filter_response_headers(headers: Iterable[tuple[str, str]]) -> dict[str, str]:
-    filtered: dict[str, str] = {}
-    for key, value in headers:
-        if key.lower() in _DROP_RESPONSE_HEADERS:
-            continue
-        filtered[key] = value
+def _forward_request_headers(headers: Iterable[tuple[str, str]]) -> list[tuple[str, str]]:
+    drop = _DROP_REQUEST_HEADERS.__contains__
+    return [(key, value) for key, value in headers if not drop(key.lower())]
+
+
+def _filter_response_headers(
+    headers: Iterable[tuple[str, str]], *, drop: frozenset[str] = _DROP_RESPONSE_HEADERS
+) -> dict[str, str]:
+    dropped = drop.__contains__
+    filtered = {key: value for key, value in headers if not dropped(key.lower())}
     filtered.setdefault("X-Robots-Tag", "noindex")
     return filtered
 
 
-async def proxy_marimo_http(request: Request, *, mount: str, path: str) -> Response:
-    upstream_url = _join_url(_marimo_base_url(), path=path, query=str(request.url.query))
+def _upstream_unavailable(exc: httpx.RequestError) -> Response:
+    body = (
+        _ERR_PREFIX
+        + html_escape(_marimo_base_url()).encode("utf-8")
+        + _ERR_MID
+        + html_escape(str(exc)).encode("utf-8")
+        + _ERR_SUFFIX
+    )
+    return Response(content=body, status_code=502, media_type="text/html")
+
 
+async def _stream_upstream(upstream: httpx.Response) -> AsyncIterator[bytes]:
+    # Close in finally so a client disconnect mid-body still releases the pooled connection.
     try:
-        body = await request.body()
-        async with httpx.AsyncClient(follow_redirects=False, timeout=30.0) as client:
-            upstream = await client.request(
-                request.method,
-                upstream_url,
-                headers=_forward_request_headers(request.headers.items()),
-                content=body,
-            )
-    except httpx.RequestError as exc:
-        msg = (
-            "<!doctype html><html><head><meta charset=\"utf-8\" />"
-            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />"
-            "<title>Embed unavailable</title></head><body>"
-            "<h1>Embed unavailable</h1>"
-            "<p>The Marimo service could not be reached from this server.</p>"
-            f"<p><code>{html_escape(_marimo_base_url())}</code></p>"
-            "<p>For local dev, set "
-            f"<code>{html_escape(MARIMO_SEMANTIC_ENTROPY_BASE_URL_ENV)}</code> "
-            "to a reachable URL.</p>"
-            f"<pre>{html_escape(str(exc))}</pre>"
-            "</body></html>"
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    finally:
+        await upstream.aclose()
+
+
+async def proxy_marimo_http(request: Request, *, mount: str, path: str) -> Response:
+    upstream_url = _join_url(_marimo_base_url(), path=path, query=_scope_query(request.scope))
+
+    forward_headers = _forward_request_headers(request.headers.items())
+    body: bytes | AsyncIterator[bytes] | None = None
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) <= _SMALL_BODY_LIMIT:
+            # Small bodies are cheaper to buffer than to forward with chunked framing.
+            body = await request.body()
+        else:
+            # Keep the client's length so httpx streams the body without chunked framing.
+            forward_headers.append(("content-length", content_length))
+            body = request.stream()
+    elif "transfer-encoding" in request.headers:
+        body = request.stream()
+
+    client = get_client()
+    try:
+        upstream_request = client.build_request(
+            request.method, upstream_url, headers=forward_headers, content=body
         )
-        return HTMLResponse(content=msg, status_code=502)
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.RequestError as exc:
+        return _upstream_unavailable(exc)
 
-    headers = _filter_response_headers(upstream.headers.items())
+    content_type = upstream.headers.get("content-type", "")
+    is_html = "text/html" in content_type
+    headers = _filter_response_headers(
+        upstream.headers.items(),
+        drop=_DROP_RESPONSE_HEADERS if is_html else _DROP_STREAMED_RESPONSE_HEADERS,
+    )
 
     location = upstream.headers.get("location")
     if location:
         headers["location"] = _rewrite_location(location, mount=mount)
 
-    content = upstream.content
-    content_type = upstream.headers.get("content-type", "")
-    if "text/html" in content_type:
-        theme_cookie = request.cookies.get("theme")
-        theme = theme_cookie if theme_cookie in {"dark", "light"} else None
-        content = _rewrite_html(content, mount=mount, theme=theme)
-        headers.pop("content-length", None)
-        if theme is not None:
-            _append_vary(headers, "Cookie")
+    if not is_html:
+        # Pass non-HTML bodies (JS bundles, wasm, JSON, images) through as they arrive.
+        return StreamingResponse(
+            _stream_upstream(upstream),
+            status_code=upstream.status_code,
+            headers=headers,
+        )
+
+    try:
+        content = await upstream.aread()
+    except httpx.RequestError as exc:
+        return _upstream_unavailable(exc)
+    finally:
+        await upstream.aclose()
+
+    theme_cookie = request.cookies.get("theme")
+    theme = theme_cookie if theme_cookie in {"dark", "light"} else None
+    content = _rewrite_html(content, mount=mount, theme=theme)
+    if theme is not None:
+        _append_vary(headers, "Cookie")
 
     return Response(content=content, status_code=upstream.status_code, headers=headers)
 
 
 async def proxy_marimo_websocket(websocket: WebSocket, *, mount: str, path: str) -> None:
-    try:
-        import anyio
-        import websockets
-    except Exception:
+    if websockets is None:
         await websocket.close(code=1011)
         return
 
-    base = _marimo_base_url()
-    if base.startswith("https://"):
-        ws_base = "wss://" + base.removeprefix("https://").lstrip("/")
-    elif base.startswith("http://"):
-        ws_base = "ws://" + base.removeprefix("http://").lstrip("/")
-    else:
-        ws_base = base
-
-    upstream_url = _join_url(ws_base, path=path, query=str(websocket.url.query))
+    upstream_url = _join_url(
+        _ws_base(_marimo_base_url()), path=path, query=_scope_query(websocket.scope)
+    )
 
     subprotocols: list[Subprotocol] = []
     raw_protocol = websocket.headers.get("sec-websocket-protocol")
@@ -261,6 +388,9 @@ async def proxy_marimo_websocket(websocket: WebSocket, *, mount: str, path: str)
             additional_headers=upstream_headers,
             subprotocols=subprotocols or None,
             max_size=None,
+            # Marimo kernels emit bursts of small frames; buffer more of them on both sides.
+            max_queue=_WS_MAX_QUEUE,
+            write_limit=_WS_WRITE_LIMIT,
         )
     except Exception:
         logger.exception("Marimo WS upstream connect failed: %s", upstream_url)
@@ -271,20 +401,24 @@ async def proxy_marimo_websocket(websocket: WebSocket, *, mount: str, path: str)
     selected_subprotocol = getattr(upstream, "subprotocol", None)
     await websocket.accept(subprotocol=selected_subprotocol)
 
-    async def _client_to_upstream(tg: anyio.abc.TaskGroup) -> None:
+    async def _client_to_upstream() -> None:
+        receive = websocket.receive
         try:
             while True:
-                message = await websocket.receive()
-                msg_type = message.get("type")
+                message = await receive()
+                msg_type = message["type"]
                 if msg_type == "websocket.disconnect":
                     await upstream.close()
                     return
                 if msg_type != "websocket.receive":
                     continue
-                if message.get("text") is not None:
-                    await upstream.send(message["text"])
-                elif message.get("bytes") is not None:
-                    await upstream.send(message["bytes"])
+                text = message.get("text")
+                if text is not None:
+                    await upstream.send(text)
+                    continue
+                data = message.get("bytes")
+                if data is not None:
+                    await upstream.send(data)
         except Exception:
             logger.exception("Marimo WS client->upstream failed: %s", upstream_url)
         finally:
@@ -292,15 +426,15 @@ async def proxy_marimo_websocket(websocket: WebSocket, *, mount: str, path: str)
                 await upstream.close()
             except Exception:
                 pass
-            tg.cancel_scope.cancel()
 
-    async def _upstream_to_client(tg: anyio.abc.TaskGroup) -> None:
+    async def _upstream_to_client() -> None:
+        send = websocket.send
         try:
             async for message in upstream:
                 if isinstance(message, str):
-                    await websocket.send_text(message)
+                    await send({"type": "websocket.send", "text": message})
                 else:
-                    await websocket.send_bytes(message)
+                    await send({"type": "websocket.send", "bytes": message})
         except Exception:
             logger.exception("Marimo WS upstream->client failed: %s", upstream_url)
         finally:
@@ -310,13 +444,15 @@ async def proxy_marimo_websocket(websocket: WebSocket, *, mount: str, path: str)
                 await websocket.close(code=code, reason=reason)
             except Exception:
                 pass
-            tg.cancel_scope.cancel()
 
     try:
         async with upstream:
-            async with anyio.create_task_group() as tg:
-                tg.start_soon(_client_to_upstream, tg)
-                tg.start_soon(_upstream_to_client, tg)
+            async with asyncio.TaskGroup() as tg:
+                to_upstream = tg.create_task(_client_to_upstream())
+                to_client = tg.create_task(_upstream_to_client())
+                # Whichever direction finishes first tears down the other one.
+                to_upstream.add_done_callback(lambda _: to_client.cancel())
+                to_client.add_done_callback(lambda _: to_upstream.cancel())
     finally:
         try:
             await upstream.close()
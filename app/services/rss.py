@@ -1,46 +1,65 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from html import escape
 from typing import List
 
-from .content import Post, list_posts
+from .content import Post, list_posts, posts_version
 from .site_config import get_site_config
 
+_FMT = "%a, %d %b %Y %H:%M:%S %z"
 
-def _rss_item_xml(post: Post) -> str:
-    cfg = get_site_config()
-    pub_date = post.date.astimezone(UTC).strftime("%a, %d %b %Y %H:%M:%S %z")
-    canonical_path = post.canonical_path or f"/blog/{post.slug}"
-    link = cfg.canonical_url(canonical_path)
-    title = escape(post.title)
-    description = escape(post.summary or post.title)
-    return (
-        f"<item>"
-        f"<title>{title}</title>"
-        f"<link>{link}</link>"
-        f"<guid>{link}</guid>"
-        f"<pubDate>{pub_date}</pubDate>"
-        f"<description>{description}</description>"
-        f"</item>"
-    )
+
+def _rfc822(value: datetime) -> str:
+    if value.tzinfo is not UTC:
+        value = value.astimezone(UTC)
+    return value.strftime(_FMT)
+
+
+@dataclass
+class _FeedCache:
+    version: int = -1
+    xml: str = ""
+
+
+_feed_cache = _FeedCache()
 
 
 def render_rss() -> str:
+    # The feed only changes when posts do; rebuild on a new post-index version.
+    version = posts_version()
+    if _feed_cache.version != version:
+        _feed_cache.xml = _build_rss()
+        _feed_cache.version = version
+    return _feed_cache.xml
+
+
+def _build_rss() -> str:
     cfg = get_site_config()
     posts: List[Post] = list_posts(limit=20)
-    items = "".join(_rss_item_xml(p) for p in posts)
-    last_build_date = datetime.now(tz=UTC).strftime("%a, %d %b %Y %H:%M:%S %z")
-    xml = (
+    canonical_url = cfg.canonical_url
+    esc = escape
+    out = [
         "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
         "<rss version=\"2.0\">"
         "<channel>"
-        f"<title>{escape(cfg.site_title)}</title>"
+        f"<title>{esc(cfg.site_title)}</title>"
         f"<link>{cfg.base_url}</link>"
-        f"<description>{escape(cfg.site_description)}</description>"
-        f"<lastBuildDate>{last_build_date}</lastBuildDate>"
-        f"{items}"
-        "</channel>"
-        "</rss>"
-    )
-    return xml
+        f"<description>{esc(cfg.site_description)}</description>"
+        f"<lastBuildDate>{datetime.now(tz=UTC).strftime(_FMT)}</lastBuildDate>"
+    ]
+    append = out.append
+    for post in posts:
+        link = canonical_url(post.canonical_path or f"/blog/{post.slug}")
+        append(
+            f"<item>"
+            f"<title>{esc(post.title)}</title>"
+            f"<link>{link}</link>"
+            f"<guid>{link}</guid>"
+            f"<pubDate>{_rfc822(post.date)}</pubDate>"
+            f"<description>{esc(post.summary or post.title)}</description>"
+            f"</item>"
+        )
+    append("</channel></rss>")
+    return "".join(out)
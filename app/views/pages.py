@@ -2,26 +2,136 @@ from __future__ import annotations
 
 import hashlib
 import json
-from collections.abc import Iterable
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
 from html import escape
+from itertools import groupby
 from pathlib import Path
-
-from ..services.content import Page, Post, list_posts, syntax_highlight_css
+from urllib.parse import quote
+
+from ..services.content import (
+    PAGES_DIR,
+    Page,
+    Post,
+    get_page,
+    get_post_by_slug,
+    list_posts,
+    list_posts_by_year,
+    posts_version,
+    syntax_highlight_css,
+)
 from ..services.site_config import SiteConfig, get_site_config
 
 _STATIC_ROOT = Path(__file__).resolve().parent.parent / "static"
+# Identical for every page; resolved once instead of per render.
+_SYNTAX_CSS = syntax_highlight_css()
+# Footer copyright year, re-read at most once an hour so a long-lived process rolls over.
+_YEAR_RECHECK_SECONDS = 3600.0
+
+
+@dataclass
+class _FooterYear:
+    year: int = 0
+    checked_at: float = float("-inf")
+
+
+_footer_year = _FooterYear()
+
+
+def _current_year() -> int:
+    now = time.monotonic()
+    if now - _footer_year.checked_at >= _YEAR_RECHECK_SECONDS:
+        _footer_year.year = datetime.now().year
+        _footer_year.checked_at = now
+    return _footer_year.year
+
+
+# The bundled marimo export is served by its own routes and never goes through static_url.
+_MANIFEST_SKIP_DIRS = frozenset({"marimo"})
+_MANIFEST_POOL_MIN_FILES = 4
+_MANIFEST_POOL_WORKERS = 4
+
+
+def _blake2b_48() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=6)
+
+
+def _file_digest(file_path: str | Path) -> str:
+    # A cache-buster, not a security boundary: a 48-bit blake2b gives the same 12 hex chars.
+    with open(file_path, "rb") as fh:
+        return hashlib.file_digest(fh, _blake2b_48).hexdigest()
+
+
+def _walk_static(root: str) -> Iterator[tuple[str, str]]:
+    """Yield ``(relative_path, path)`` for every file below ``root``.
+
+    Uses the cached ``DirEntry`` type info from ``os.scandir`` instead of a ``stat`` per entry.
+    """
+    stack = [("", root)]
+    while stack:
+        prefix, directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if prefix or entry.name not in _MANIFEST_SKIP_DIRS:
+                        stack.append((f"{prefix}{entry.name}/", entry.path))
+                elif entry.is_file():
+                    yield f"{prefix}{entry.name}", entry.path
+
+
+def _build_static_manifest(root: Path) -> dict[str, str]:
+    files = list(_walk_static(str(root)))
+    paths = [path for _, path in files]
+    if len(files) < _MANIFEST_POOL_MIN_FILES:
+        digests = list(map(_file_digest, paths))
+    else:
+        # hashlib releases the GIL while hashing, so threads overlap the reads and the hashing.
+        with ThreadPoolExecutor(max_workers=_MANIFEST_POOL_WORKERS) as pool:
+            digests = list(pool.map(_file_digest, paths))
+    return {rel: digest for (rel, _), digest in zip(files, digests, strict=True)}
+
+
+# Fingerprinted URLs for every asset, built once at import so no request pays for a hash.
+_STATIC_URLS = {
+    path: f"/static/{path}?v={digest}"
+    for path, digest in _build_static_manifest(_STATIC_ROOT).items()
+}
 
 
-@lru_cache(maxsize=None)
 def static_url(path: str) -> str:
-    file_path = _STATIC_ROOT / path
-    try:
-        digest = hashlib.sha1(file_path.read_bytes()).hexdigest()[:12]
-    except FileNotFoundError:
-        return f"/static/{path}"
-    return f"/static/{path}?v={digest}"
+    url = _STATIC_URLS.get(path)
+    if url is None:
+        # Assets added after startup (or outside the manifest) are hashed on first use.
+        try:
+            url = f"/static/{path}?v={_file_digest(_STATIC_ROOT / path)}"
+        except FileNotFoundError:
+            url = f"/static/{path}"
+        _STATIC_URLS[path] = url
+    return url
+
+
+_BASE_CSS_URL = static_url("base.css")
+_ABOUT_PORTRAIT_URL = static_url("about-portrait.png")
+_COURSEWORK_JS_URL = static_url("coursework.js")
+_COURSEWORK_CSS_URL = static_url("coursework.css")
+
+# Layout segments that are identical for every page, assembled once at import.
+_HEAD_ASSETS = f"""    <link rel="preconnect" href="https://fonts.googleapis.com" />
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
+    <link href="https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&family=JetBrains+Mono:wght@400;600&display=swap" rel="stylesheet" />
+    <link rel="stylesheet" href="{_BASE_CSS_URL}" />"""
+_SYNTAX_STYLE = f"<style>{_SYNTAX_CSS}</style>"
+_FOOTER_TAIL = """</small>
+      <a href="/feed.xml">RSS</a>
+    </footer>
+  </body>
+</html>
+"""
 
 
 def _is_active(path: str, current_path: str) -> bool:
@@ -35,6 +145,52 @@ def _nav_link(path: str, label: str, current_path: str) -> str:
     return f'<a href="{path}"{active}>{label}</a>'
 
 
+_NAV_ITEMS = (("/", "About"), ("/blog", "Blog"), ("/coursework", "Coursework"))
+
+
+def _active_nav_path(current_path: str) -> str | None:
+    for path, _ in _NAV_ITEMS:
+        if _is_active(path, current_path):
+            return path
+    return None
+
+
+def _nav_prefix(active: str | None) -> str:
+    links = "\n          ".join(
+        [_nav_link(path, label, active or "") for path, label in _NAV_ITEMS]
+    )
+    return (
+        '        <nav class="site-nav" aria-label="Main">\n'
+        f"          {links}\n"
+        '          <a id="theme-toggle" href="/toggle-theme?next='
+    )
+
+
+# Nav markup up to the theme toggle's ``next=`` value, one variant per active section.
+_NAV_PREFIXES = {
+    active: _nav_prefix(active) for active in (None, *(path for path, _ in _NAV_ITEMS))
+}
+
+
+_NAV_BY_PATH: dict[str, str] = {}
+_NAV_BY_PATH_MAX = 1024
+
+
+def _nav_html(current_path: str) -> str:
+    """Nav links plus the theme toggle, whose ``next=`` carries the URL-encoded path."""
+    html = _NAV_BY_PATH.get(current_path)
+    if html is None:
+        target = escape(quote(current_path, safe="/"), quote=True)
+        html = (
+            f"{_NAV_PREFIXES[_active_nav_path(current_path)]}{target}"
+            '" aria-label="Toggle theme">Theme</a>\n'
+        )
+        if len(_NAV_BY_PATH) >= _NAV_BY_PATH_MAX:
+            _NAV_BY_PATH.clear()
+        _NAV_BY_PATH[current_path] = html
+    return html
+
+
 def _meta_title(value: str, cfg: SiteConfig) -> str:
     if cfg.author_name.lower() in value.lower():
         return value
@@ -72,58 +228,78 @@ def _layout(
     theme_attr = f' data-theme="{escape(theme)}"' if theme else ""
     class_attr = f' class="{escape(body_class)}"' if body_class else ""
     brand = escape(cfg.author_name)
-
-    return f"""
-<!doctype html>
-<html lang=\"en\"{theme_attr}>
-  <head>
-    <meta charset=\"utf-8\" />
-    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-    <title>{title}</title>
-    <meta name=\"description\" content=\"{description}\" />
-    <meta name=\"robots\" content=\"{robots}\" />
-    <link rel=\"canonical\" href=\"{escape(canonical_url)}\" />
-    <meta property=\"og:site_name\" content=\"{escape(cfg.site_title)}\" />
-    <meta property=\"og:type\" content=\"{og_type}\" />
-    <meta property=\"og:title\" content=\"{title}\" />
-    <meta property=\"og:description\" content=\"{description}\" />
-    <meta property=\"og:url\" content=\"{escape(canonical_url)}\" />
-    <meta property=\"og:image\" content=\"{escape(og_image)}\" />
-    <meta name=\"twitter:card\" content=\"{twitter_card}\" />
-    <meta name=\"twitter:title\" content=\"{title}\" />
-    <meta name=\"twitter:description\" content=\"{description}\" />
-    <meta name=\"twitter:image\" content=\"{escape(og_image)}\" />
-    <link rel=\"preconnect\" href=\"https://fonts.googleapis.com\" />
-    <link rel=\"preconnect\" href=\"https://fonts.gstatic.com\" crossorigin />
-    <link href=\"https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&family=JetBrains+Mono:wght@400;600&display=swap\" rel=\"stylesheet\" />
-    <link rel=\"stylesheet\" href=\"{static_url('base.css')}\" />
-    {extra_head}
-    <style>{syntax_highlight_css()}</style>
-    {json_ld}
-  </head>
-  <body{class_attr}>
-    <a class=\"skip-link\" href=\"#content\">Skip to content</a>
-    <header class=\"site-header\">
-      <div class=\"nav-shell\">
-        <a class=\"site-brand\" href=\"/\">{brand}</a>
-        <nav class=\"site-nav\" aria-label=\"Main\">
-          {_nav_link('/', 'About', current_path)}
-          {_nav_link('/blog', 'Blog', current_path)}
-          {_nav_link('/coursework', 'Coursework', current_path)}
-          <a id=\"theme-toggle\" href=\"/toggle-theme?next={escape(current_path, quote=True)}\" aria-label=\"Toggle theme\">Theme</a>
-        </nav>
-      </div>
-    </header>
-    <main id=\"content\" class=\"site-main\">
-      {body}
-    </main>
-    <footer class=\"site-footer\">
-      <small>© {datetime.now().year} {brand}</small>
-      <a href=\"/feed.xml\">RSS</a>
-    </footer>
-  </body>
-</html>
-"""
+    canonical_href = escape(canonical_url)
+    og_image_href = escape(og_image)
+
+    # One join over a fixed list: str.join sizes the result once instead of growing it.
+    return "".join(
+        [
+            '\n<!doctype html>\n<html lang="en"',
+            theme_attr,
+            ">\n  <head>\n"
+            '    <meta charset="utf-8" />\n'
+            '    <meta name="viewport" content="width=device-width, initial-scale=1" />\n'
+            "    <title>",
+            title,
+            '</title>\n    <meta name="description" content="',
+            description,
+            '" />\n    <meta name="robots" content="',
+            robots,
+            '" />\n    <link rel="canonical" href="',
+            canonical_href,
+            '" />\n    <meta property="og:site_name" content="',
+            escape(cfg.site_title),
+            '" />\n    <meta property="og:type" content="',
+            og_type,
+            '" />\n    <meta property="og:title" content="',
+            title,
+            '" />\n    <meta property="og:description" content="',
+            description,
+            '" />\n    <meta property="og:url" content="',
+            canonical_href,
+            '" />\n    <meta property="og:image" content="',
+            og_image_href,
+            '" />\n    <meta name="twitter:card" content="',
+            twitter_card,
+            '" />\n    <meta name="twitter:title" content="',
+            title,
+            '" />\n    <meta name="twitter:description" content="',
+            description,
+            '" />\n    <meta name="twitter:image" content="',
+            og_image_href,
+            '" />\n',
+            _HEAD_ASSETS,
+            "\n    ",
+            extra_head,
+            "\n    ",
+            _SYNTAX_STYLE,
+            "\n    ",
+            json_ld,
+            "\n  </head>\n  <body",
+            class_attr,
+            ">\n"
+            '    <a class="skip-link" href="#content">Skip to content</a>\n'
+            '    <header class="site-header">\n'
+            '      <div class="nav-shell">\n'
+            '        <a class="site-brand" href="/">',
+            brand,
+            "</a>\n",
+            _nav_html(current_path),
+            "        </nav>\n"
+            "      </div>\n"
+            "    </header>\n"
+            '    <main id="content" class="site-main">\n'
+            "      ",
+            body,
+            "\n    </main>\n"
+            '    <footer class="site-footer">\n'
+            "      <small>© ",
+            str(_current_year()),
+            " ",
+            brand,
+            _FOOTER_TAIL,
+        ]
+    )
 
 
 def _person_same_as(page_meta: dict[str, object], cfg: SiteConfig) -> list[str]:
@@ -141,24 +317,17 @@ def _person_same_as(page_meta: dict[str, object], cfg: SiteConfig) -> list[str]:
     return same_as
 
 
-def _render_tag_spans(tags: list[str]) -> str:
-    if not tags:
-        return ""
-    spans = " ".join(f"<span>#{escape(tag)}</span>" for tag in tags)
-    return f'<p class="post-tags">{spans}</p>'
-
-
 def render_home_page(posts: Iterable[Post], theme: str | None = None, current_path: str = "/") -> str:
     cfg = get_site_config()
-    post_items = "\n".join(
-        (
-            "<li>"
-            f"<a href=\"/blog/{escape(p.slug)}\">{escape(p.title)}</a>"
-            f"<time datetime=\"{p.date.isoformat()}\">{p.date.date()}</time>"
-            "</li>"
+    items: list[str] = []
+    append = items.append
+    for p in posts:
+        when = p.date
+        append(
+            f'<li><a href="/blog/{escape(p.slug)}">{escape(p.title)}</a>'
+            f'<time datetime="{when.isoformat()}">{when.date()}</time></li>'
         )
-        for p in posts
-    )
+    post_items = "\n".join(items)
     body = f"""
     <section class=\"home-list reveal\">
       <h1>{escape(cfg.author_name)}</h1>
@@ -181,36 +350,47 @@ def render_home_page(posts: Iterable[Post], theme: str | None = None, current_pa
 
 
 def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
+    return _render_cached("about", _about_tag(), _current_year(), theme, current_path)
+
+
+_EMPTY_META: dict[str, object] = {}
+
+
+def _quote_items(quotes_escaped: Iterable[str]) -> str:
+    return "".join(
+        [f"<li><blockquote>&ldquo;{q}&rdquo;</blockquote></li>" for q in quotes_escaped]
+    )
+
+
+_DEFAULT_QUOTE_ITEMS = _quote_items(
+    escape(q)
+    for q in (
+        "Build things that are useful before making them impressive.",
+        "Keep experiments reproducible and writing clear.",
+        "Simple systems leave room for deep ideas.",
+    )
+)
+
+
+def _render_about_page(theme: str | None = None, current_path: str = "/") -> str:
     page: Page | None = None
     page_meta: dict[str, object]
     try:
-        from ..services.content import get_page
-
         page = get_page("about")
     except Exception:
         page = None
 
     cfg = get_site_config()
-    page_meta = dict(page.meta or {}) if page else {}
-
-    quotes_list: list[str] = []
-    if page and page.quotes:
-        quotes_list = [str(q) for q in page.quotes]
-    if not quotes_list:
-        quotes_list = [
-            "Build things that are useful before making them impressive.",
-            "Keep experiments reproducible and writing clear.",
-            "Simple systems leave room for deep ideas.",
-        ]
+    # Only ever read, so share the Page's dict instead of copying it.
+    page_meta = page.meta if page and page.meta else _EMPTY_META
 
-    quote_items = "".join(
-        f"<li><blockquote>&ldquo;{escape(str(q))}&rdquo;</blockquote></li>" for q in quotes_list
-    )
+    meta_escaped = page.meta_escaped if page else {}
+
+    quotes_escaped = page.quotes_escaped if page else []
+    quote_items = _quote_items(quotes_escaped) if quotes_escaped else _DEFAULT_QUOTE_ITEMS
 
     featured = None
     if page and page.featured_slug:
-        from ..services.content import get_post_by_slug
-
         featured = get_post_by_slug(page.featured_slug)
     if featured is None:
         featured = next(iter(list_posts(limit=1)), None)
@@ -225,22 +405,7 @@ def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
             "</a>"
         )
 
-    links_raw = page_meta.get("links")
-    contact_items: list[str] = []
-    if isinstance(links_raw, list):
-        for item in links_raw:
-            if not isinstance(item, dict):
-                continue
-            label_raw = item.get("label") or item.get("name") or item.get("title")
-            url_raw = item.get("url")
-            note_raw = item.get("note") or item.get("description")
-            if not label_raw or not url_raw:
-                continue
-            label = escape(str(label_raw))
-            url = escape(str(url_raw), quote=True)
-            note = escape(str(note_raw)) if note_raw else ""
-            note_span = f'<span class="about-link-note">{note}</span>' if note else ""
-            contact_items.append(f"<li><a href=\"{url}\">{label}</a>{note_span}</li>")
+    contact_items = page.links_prebuilt if page else []
 
     links_block = ""
     if contact_items:
@@ -251,12 +416,18 @@ def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
             "</div>"
         )
 
-    hero_title_raw = page_meta.get("hero_title") or (page.title if page else None) or cfg.author_name
-    hero_title = escape(str(hero_title_raw))
-    hero_tagline_raw = page_meta.get("hero_tagline") or page_meta.get("tagline") or cfg.author_role
-    hero_tagline = escape(str(hero_tagline_raw))
-    location = page_meta.get("location")
-    location_html = f'<p class="about-location">{escape(str(location))}</p>' if location else ""
+    hero_title = (
+        meta_escaped.get("hero_title")
+        or (escape(page.title) if page and page.title else None)
+        or escape(cfg.author_name)
+    )
+    hero_tagline = (
+        meta_escaped.get("hero_tagline")
+        or meta_escaped.get("tagline")
+        or escape(cfg.author_role)
+    )
+    location = meta_escaped.get("location")
+    location_html = f'<p class="about-location">{location}</p>' if location else ""
 
     body_md = page.html if page else "<p>About content is being drafted.</p>"
 
@@ -264,7 +435,7 @@ def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
     <section class=\"about-layout reveal\">
       <aside class=\"about-sidebar\">
         <figure class=\"about-photo\">
-          <img src=\"{static_url('about-portrait.png')}\" alt=\"Portrait of Gunay Soni\" width=\"864\" height=\"1098\" loading=\"lazy\" />
+          <img src=\"{_ABOUT_PORTRAIT_URL}\" alt=\"Portrait of Gunay Soni\" width=\"864\" height=\"1098\" loading=\"lazy\" />
         </figure>
         {location_html}
         {featured_block}
@@ -300,7 +471,7 @@ def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
         "url": cfg.canonical_url("/"),
         "sameAs": same_as,
     }
-    meta = {
+    meta: dict[str, object] = {
         "title": _meta_title(page.seo_title if page and page.seo_title else cfg.author_name, cfg),
         "description": description,
         "canonical_path": page.canonical_path if page and page.canonical_path else "/",
@@ -316,26 +487,35 @@ def render_about_page(theme: str | None = None, current_path: str = "/") -> str:
     )
 
 
-def render_blog_index_page(posts: Iterable[Post], theme: str | None = None, current_path: str = "/") -> str:
-    cfg = get_site_config()
-    groups: dict[int, list[Post]] = {}
-    for post in posts:
-        groups.setdefault(post.date.year, []).append(post)
+def render_blog_index_page(
+    posts: Iterable[Post] | None = None, theme: str | None = None, current_path: str = "/"
+) -> str:
+    if posts is None:
+        tag = str(posts_version())
+        return _render_cached("blog_index", tag, _current_year(), theme, current_path)
+    ordered = sorted(posts, key=lambda post: post.date, reverse=True)
+    grouped = groupby(ordered, key=lambda post: post.date.year)
+    by_year = [(year, list(group)) for year, group in grouped]
+    return _render_blog_index_page(by_year, theme=theme, current_path=current_path)
 
+
+def _render_blog_index_page(
+    by_year: Iterable[tuple[int, list[Post]]], theme: str | None = None, current_path: str = "/"
+) -> str:
+    cfg = get_site_config()
     year_sections: list[str] = []
-    for year in sorted(groups.keys(), reverse=True):
-        cards = "".join(
-            (
-                '<article class="post-card">'
-                + f"<h3><a href=\"/blog/{escape(p.slug)}\">{escape(p.title)}</a></h3>"
-                + f"<p>{escape(p.summary or 'Read the article')}</p>"
-                + f"<time datetime=\"{p.date.isoformat()}\">{p.date.date()}</time>"
-                + _render_tag_spans(p.tags)
-                + "</article>"
+    for year, year_posts in by_year:
+        cards: list[str] = []
+        append = cards.append
+        for p in year_posts:
+            when = p.date
+            append(
+                f'<article class="post-card"><h3><a href="/blog/{escape(p.slug)}">'
+                f"{escape(p.title)}</a></h3><p>{escape(p.summary or 'Read the article')}</p>"
+                f'<time datetime="{when.isoformat()}">{when.date()}</time>'
+                f"{p.tags_html}</article>"
             )
-            for p in groups[year]
-        )
-        year_sections.append(f'<section class="blog-year"><h2>{year}</h2><div class="post-grid">{cards}</div></section>')
+        year_sections.append(f'<section class="blog-year"><h2>{year}</h2><div class="post-grid">{"".join(cards)}</div></section>')
 
     body = f"""
     <section class=\"blog-shell reveal\">
@@ -366,7 +546,25 @@ def render_blog_index_page(posts: Iterable[Post], theme: str | None = None, curr
     return _layout(meta=meta, body=body, theme=theme, current_path=current_path)
 
 
+# Rendered post pages keyed by (slug, theme, current_path, year); an entry is reused only
+# while it was rendered from the very same (cached, immutable) Post object.
+_POST_PAGE_CACHE: dict[tuple[str, str | None, str, int], tuple[Post, str]] = {}
+_POST_PAGE_CACHE_MAX = 512
+
+
 def render_post_page(post: Post, theme: str | None = None, current_path: str = "/") -> str:
+    key = (post.slug, theme, current_path, _current_year())
+    cached = _POST_PAGE_CACHE.get(key)
+    if cached is not None and cached[0] is post:
+        return cached[1]
+    html = _render_post_page(post, theme=theme, current_path=current_path)
+    if len(_POST_PAGE_CACHE) >= _POST_PAGE_CACHE_MAX:
+        _POST_PAGE_CACHE.clear()
+    _POST_PAGE_CACHE[key] = (post, html)
+    return html
+
+
+def _render_post_page(post: Post, theme: str | None = None, current_path: str = "/") -> str:
     cfg = get_site_config()
     extra_head_parts: list[str] = []
     if post.extra_css:
@@ -378,17 +576,13 @@ def render_post_page(post: Post, theme: str | None = None, current_path: str = "
     if post.wide:
         body_class = "wide post-page"
 
-    tags_html = ""
-    if post.tags:
-        tags_html = f"<p class=\"post-tags\">{' '.join(f'<span>#{escape(tag)}</span>' for tag in post.tags)}</p>"
-
     body = f"""
     <article class=\"post-article reveal\">
       <header class=\"post-header\">
         <p class=\"about-eyebrow\">Article</p>
         <h1>{escape(post.title)}</h1>
         <time datetime=\"{post.date.isoformat()}\">{post.date.date()}</time>
-        {tags_html}
+        {post.tags_html}
       </header>
       <div class=\"post\">{post.html}</div>
     </article>
@@ -426,9 +620,11 @@ def render_post_page(post: Post, theme: str | None = None, current_path: str = "
 
 
 def render_coursework_page(theme: str | None = None, current_path: str = "/") -> str:
+    return _render_cached("coursework", "", _current_year(), theme, current_path)
+
+
+def _render_coursework_page(theme: str | None = None, current_path: str = "/") -> str:
     cfg = get_site_config()
-    coursework_js = static_url("coursework.js")
-    coursework_css = static_url("coursework.css")
 
     body = f"""
     <section class=\"cw-page reveal\">
@@ -480,7 +676,7 @@ def render_coursework_page(theme: str | None = None, current_path: str = "/") ->
     </section>
 
     <script src=\"https://cdn.jsdelivr.net/npm/d3@7\"></script>
-    <script src=\"{coursework_js}\"></script>
+    <script src=\"{_COURSEWORK_JS_URL}\"></script>
     """
 
     json_ld = {
@@ -502,5 +698,33 @@ def render_coursework_page(theme: str | None = None, current_path: str = "/") ->
         theme=theme,
         current_path=current_path,
         body_class="wide coursework-page",
-        extra_head=f'<link rel="stylesheet" href="{coursework_css}" />',
+        extra_head=f'<link rel="stylesheet" href="{_COURSEWORK_CSS_URL}" />',
     )
+
+
+def _about_tag() -> str:
+    # The about page pulls in the featured/latest post, so it also tracks the post index.
+    try:
+        mtime_ns = (PAGES_DIR / "about.md").stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return f"{posts_version()}:{mtime_ns}"
+
+
+_CACHED_RENDERERS: dict[str, Callable[..., str]] = {
+    "about": _render_about_page,
+    "coursework": _render_coursework_page,
+    "blog_index": lambda **kwargs: _render_blog_index_page(list_posts_by_year(), **kwargs),
+}
+
+
+@lru_cache(maxsize=32)
+def _render_cached(
+    name: str, content_tag: str, year: int, theme: str | None, current_path: str
+) -> str:
+    """Render a page whose output depends only on its content tag, the year and the request.
+
+    ``content_tag`` and ``year`` are not passed to the renderer; they only key the cache so a
+    content change or a new year (footer copyright) produces a fresh render.
+    """
+    return _CACHED_RENDERERS[name](theme=theme, current_path=current_path)
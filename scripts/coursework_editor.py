@@ -1,89 +1,275 @@
 from __future__ import annotations
 
-import json
+import asyncio
+from collections.abc import Callable, Iterator, Mapping
+import copy
+from dataclasses import dataclass, field
+import gzip
+from operator import itemgetter
+import os
 from pathlib import Path
 import re
-from typing import Any
+import threading
+from types import MappingProxyType
+from typing import Annotated, Any
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
+from pydantic import BaseModel, ConfigDict, StringConstraints, field_validator
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 COURSEWORK_PATH = REPO_ROOT / "app" / "static" / "courses.json"
 
 app = FastAPI(title="Coursework Editor", docs_url="/docs")
 
+_CACHE_LOCK = threading.Lock()
+# Serializes read-modify-write cycles so overlapping flushes can't drop each other's edits.
+_WRITE_LOCK = threading.Lock()
+_WRITE_BUFFER = 64 * 1024
+_WRITE_BEHIND_SECONDS = 0.05
 
-def _read_coursework() -> dict[str, Any]:
+
+@dataclass(slots=True)
+class _CourseworkCache:
+    # Parsed courses.json keyed on (st_mtime_ns, st_size); handlers run in the threadpool.
+    key: tuple[int, int]
+    data: dict[str, Any]
+    state_body: bytes | None = None
+
+
+_CACHE: _CourseworkCache | None = None
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int]:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cached_coursework() -> _CourseworkCache:
+    global _CACHE
     try:
-        return json.loads(COURSEWORK_PATH.read_text(encoding="utf-8"))
+        with _CACHE_LOCK:
+            key = _stat_key(os.stat(COURSEWORK_PATH))
+            cache = _CACHE
+            if cache is None or cache.key != key:
+                data = orjson.loads(COURSEWORK_PATH.read_bytes())
+                _normalize_course_ids(data)
+                cache = _CACHE = _CourseworkCache(key, data)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail=f"Missing data file: {COURSEWORK_PATH}") from exc
-    except json.JSONDecodeError as exc:
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=500, detail="courses.json is not valid JSON") from exc
+    return cache
+
+
+def _read_view(data: dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of the shared parse, so read handlers can't corrupt later cache hits."""
+    return MappingProxyType(data)
+
+
+def _read_coursework_for_write() -> dict[str, Any]:
+    # Callers mutate the hierarchy in place before writing it back.
+    return copy.deepcopy(_cached_coursework().data)
 
 
 def _write_coursework(data: dict[str, Any]) -> None:
+    """Persist ``data`` and make it the shared read view; callers must not touch it afterwards."""
+    global _CACHE
     COURSEWORK_PATH.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = COURSEWORK_PATH.with_suffix(".json.tmp")
-    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    tmp_path.replace(COURSEWORK_PATH)
+    # Same bytes as json.dumps(indent=2, ensure_ascii=False) plus a trailing newline.
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    with _CACHE_LOCK:
+        with open(tmp_path, "wb", buffering=_WRITE_BUFFER) as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+            # rename keeps the inode, so its mtime/size already match the final path.
+            key = _stat_key(os.fstat(fh.fileno()))
+        os.replace(tmp_path, COURSEWORK_PATH)
+        _CACHE = _CourseworkCache(key, data)
 
 
-def _iter_subject_nodes(hierarchy: dict[str, Any]) -> list[dict[str, Any]]:
-    children = hierarchy.get("children")
-    if not isinstance(children, list):
-        return []
-    return [c for c in children if isinstance(c, dict)]
+_Mutation = Callable[[dict[str, Any]], Any]
 
 
-def _get_or_create_subject(hierarchy: dict[str, Any], subject: str) -> dict[str, Any]:
-    for node in _iter_subject_nodes(hierarchy):
-        if node.get("name") == subject:
-            node.setdefault("children", [])
-            return node
-    node = {"name": subject, "children": []}
-    hierarchy.setdefault("children", []).append(node)
-    return node
+@dataclass(slots=True)
+class _PendingWrites:
+    mutations: list[tuple[_Mutation, asyncio.Future[Any]]] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+
+
+_PENDING: _PendingWrites | None = None
 
 
-def _iter_group_nodes(subject_node: dict[str, Any]) -> list[dict[str, Any]]:
+async def _submit_write(mutate: _Mutation) -> Any:
+    """Queue ``mutate`` for the current write-behind window and wait for it to be persisted.
+
+    Mutations arriving within the window are applied in order to one copy of the file and
+    written once; each caller gets its own result or HTTPException back.
+    """
+    global _PENDING
+    fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+    batch = _PENDING
+    if batch is None:
+        batch = _PENDING = _PendingWrites()
+        # The flush runs as its own task so a disconnecting leader can't strand the others.
+        batch.task = asyncio.create_task(_flush_after_window(batch))
+    batch.mutations.append((mutate, fut))
+    return await fut
+
+
+async def _flush_after_window(batch: _PendingWrites) -> None:
+    global _PENDING
+    await asyncio.sleep(_WRITE_BEHIND_SECONDS)
+    if _PENDING is batch:
+        _PENDING = None
+    try:
+        outcomes = await asyncio.to_thread(_apply_writes, [m for m, _ in batch.mutations])
+    except Exception as exc:
+        for _, fut in batch.mutations:
+            if not fut.done():
+                fut.set_exception(exc)
+        return
+    for (_, fut), (ok, value) in zip(batch.mutations, outcomes, strict=True):
+        if fut.done():
+            continue
+        if ok:
+            fut.set_result(value)
+        else:
+            fut.set_exception(value)
+
+
+def _apply_writes(mutations: list[_Mutation]) -> list[tuple[bool, Any]]:
+    outcomes: list[tuple[bool, Any]] = []
+    with _WRITE_LOCK:
+        data = _read_coursework_for_write()
+        for mutate in mutations:
+            try:
+                outcomes.append((True, mutate(data)))
+            except HTTPException as exc:
+                outcomes.append((False, exc))
+        if any(ok for ok, _ in outcomes):
+            _write_coursework(data)
+    return outcomes
+
+
+def _hierarchy(data: Mapping[str, Any]) -> dict[str, Any]:
+    hierarchy = data.get("hierarchy")
+    if not isinstance(hierarchy, dict):
+        raise HTTPException(status_code=500, detail="courses.json missing hierarchy")
+    return hierarchy
+
+
+def _iter_subject_nodes(hierarchy: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
+    children = hierarchy.get("children")
+    if isinstance(children, list):
+        for child in children:
+            if isinstance(child, dict):
+                yield child
+
+
+def _iter_group_nodes(subject_node: dict[str, Any]) -> Iterator[dict[str, Any]]:
     children = subject_node.get("children")
-    if not isinstance(children, list):
-        return []
-    return [c for c in children if isinstance(c, dict)]
+    if isinstance(children, list):
+        for child in children:
+            if isinstance(child, dict):
+                yield child
 
 
-def _get_or_create_group(subject_node: dict[str, Any], group: str) -> dict[str, Any]:
-    for node in _iter_group_nodes(subject_node):
-        if node.get("name") == group:
-            node.setdefault("children", [])
-            return node
-    node = {"name": group, "children": []}
-    subject_node.setdefault("children", []).append(node)
-    return node
+_SubjectIndex = dict[Any, dict[str, Any]]
+_GroupIndex = dict[tuple[Any, Any], dict[str, Any]]
+_CourseIndex = dict[str, list[tuple[list[Any], int]]]
 
 
-def _remove_course_by_id(hierarchy: dict[str, Any], course_id: str) -> None:
+def _course_id(course: dict[str, Any]) -> str:
+    return str(course.get("id") or course.get("code") or course.get("name") or "")
+
+
+def _normalize_course_ids(data: Any) -> None:
+    """Store each course's derived id under ``"id"`` so later reads are a single lookup."""
+    hierarchy = data.get("hierarchy") if isinstance(data, dict) else None
+    if not isinstance(hierarchy, dict):
+        return
     for subject in _iter_subject_nodes(hierarchy):
         for group in _iter_group_nodes(subject):
             courses = group.get("children")
             if not isinstance(courses, list):
                 continue
-            remaining: list[Any] = []
             for course in courses:
                 if not isinstance(course, dict):
-                    remaining.append(course)
                     continue
-                cid = str(course.get("id") or course.get("code") or course.get("name") or "")
-                if cid != course_id:
-                    remaining.append(course)
-            group["children"] = remaining
+                course_id = course.get("id")
+                if not course_id or not isinstance(course_id, str):
+                    course["id"] = _course_id(course)
+
+
+def _index_hierarchy(
+    hierarchy: dict[str, Any],
+) -> tuple[_SubjectIndex, _GroupIndex, _CourseIndex]:
+    """Index subjects by name, groups by (subject, group) and courses by id in one walk.
+
+    Only the first node with a given name is indexed, matching the old linear scans; course
+    locations are kept for every duplicate id so removal still drops all of them.
+    """
+    subjects: _SubjectIndex = {}
+    groups: _GroupIndex = {}
+    courses: _CourseIndex = {}
+    for subject in _iter_subject_nodes(hierarchy):
+        subject_name = subject.get("name")
+        primary = subjects.setdefault(subject_name, subject) is subject
+        for group in _iter_group_nodes(subject):
+            if primary:
+                groups.setdefault((subject_name, group.get("name")), group)
+            children = group.get("children")
+            if not isinstance(children, list):
+                continue
+            for i, course in enumerate(children):
+                if isinstance(course, dict):
+                    courses.setdefault(course["id"], []).append((children, i))
+    return subjects, groups, courses
+
+
+def _get_or_create_subject(
+    hierarchy: dict[str, Any], subjects: _SubjectIndex, subject: str
+) -> dict[str, Any]:
+    node = subjects.get(subject)
+    if node is not None:
+        node.setdefault("children", [])
+        return node
+    node = {"name": subject, "children": []}
+    hierarchy.setdefault("children", []).append(node)
+    subjects[subject] = node
+    return node
+
+
+def _get_or_create_group(
+    subject_node: dict[str, Any], groups: _GroupIndex, subject: str, group: str
+) -> dict[str, Any]:
+    node = groups.get((subject, group))
+    if node is not None:
+        node.setdefault("children", [])
+        return node
+    node = {"name": group, "children": []}
+    subject_node.setdefault("children", []).append(node)
+    groups[(subject, group)] = node
+    return node
+
+
+def _remove_course_by_id(courses: _CourseIndex, course_id: str) -> bool:
+    """Drop every course with ``course_id``; the index is stale afterwards."""
+    locations = courses.pop(course_id, None)
+    if not locations:
+        return False
+    # Locations are recorded in list order, so popping backwards keeps earlier indices valid.
+    for children, i in reversed(locations):
+        del children[i]
+    return True
 
 
-def _flatten_courses(hierarchy: dict[str, Any]) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
+def _flatten_courses(hierarchy: Mapping[str, Any]) -> list[dict[str, Any]]:
+    # Sort keys are built alongside each record so sorting never re-reads the dicts.
+    keyed: list[tuple[tuple[str, str, str, str], dict[str, Any]]] = []
     for subject in _iter_subject_nodes(hierarchy):
         subject_name = str(subject.get("name") or "")
         for group in _iter_group_nodes(subject):
@@ -94,34 +280,59 @@ def _flatten_courses(hierarchy: dict[str, Any]) -> list[dict[str, Any]]:
             for course in courses:
                 if not isinstance(course, dict):
                     continue
-                course_id = str(course.get("id") or course.get("code") or course.get("name") or "")
-                out.append(
-                    {
-                        "id": course_id,
-                        "code": course.get("code"),
-                        "name": course.get("name"),
-                        "year": course.get("year"),
-                        "description": course.get("description"),
-                        "subject": subject_name,
-                        "group": group_name,
-                    }
-                )
-    return sorted(out, key=lambda c: (c["subject"], c["group"], str(c.get("code") or ""), str(c.get("name") or "")))
+                code = course.get("code")
+                name = course.get("name")
+                record = {
+                    "id": course["id"],
+                    "code": code,
+                    "name": name,
+                    "year": course.get("year"),
+                    "description": course.get("description"),
+                    "subject": subject_name,
+                    "group": group_name,
+                }
+                keyed.append(((subject_name, group_name, str(code or ""), str(name or "")), record))
+    keyed.sort(key=itemgetter(0))
+    return [record for _, record in keyed]
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
 
 
 def _slug(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+    slug = _SLUG_RE.sub("-", value.lower()).strip("-")
     return slug or "course"
 
 
+_NonEmpty = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+_Stripped = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+
 class CoursePayload(BaseModel):
-    subject: str = Field(min_length=1)
-    group: str = Field(min_length=1)
-    id: str | None = None
-    code: str | None = None
-    name: str = Field(min_length=1)
+    # Stripping and emptiness checks run in pydantic-core rather than in the handler.
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    subject: _NonEmpty
+    group: _NonEmpty
+    id: _Stripped | None = None
+    code: _Stripped | None = None
+    name: _NonEmpty
     year: int | str | None = None
-    description: str | None = None
+    description: _Stripped | None = None
+
+    @field_validator("year", mode="before")
+    @classmethod
+    def _coerce_year(cls, value: Any) -> Any:
+        if value is None or value == "":
+            return None
+        if isinstance(value, str) and value.isascii() and value.isdigit():
+            return int(value)
+        return value
+
+
+def _json_response(content: Any) -> Response:
+    # orjson emits the same compact UTF-8 as JSONResponse without the stdlib encoder.
+    return Response(orjson.dumps(content), media_type="application/json")
 
 
 @app.get("/healthz")
@@ -129,17 +340,14 @@ def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/", response_class=HTMLResponse)
-def index() -> HTMLResponse:
-    return HTMLResponse(
-        f"""<!doctype html>
+_INDEX_HTML = """<!doctype html>
 <html lang="en">
   <head>
     <meta charset="utf-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1" />
     <title>Coursework Editor</title>
     <style>
-      :root {{
+      :root {
         color-scheme: light dark;
         --bg: #0d1117;
         --fg: #e6edf3;
@@ -147,74 +355,74 @@ def index() -> HTMLResponse:
         --card: rgba(30, 41, 59, 0.55);
         --border: rgba(148, 163, 184, 0.22);
         --accent: #60a5fa;
-      }}
-      @media (prefers-color-scheme: light) {{
-        :root {{
+      }
+      @media (prefers-color-scheme: light) {
+        :root {
           --bg: #ffffff;
           --fg: #0f172a;
           --muted: rgba(15, 23, 42, 0.72);
           --card: rgba(241, 245, 249, 0.85);
           --border: rgba(15, 23, 42, 0.12);
           --accent: #3b82f6;
-        }}
-      }}
-      * {{ box-sizing: border-box; }}
-      body {{
+        }
+      }
+      * { box-sizing: border-box; }
+      body {
         margin: 0;
         font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, sans-serif;
         background: var(--bg);
         color: var(--fg);
-      }}
-      header {{
+      }
+      header {
         padding: 1.5rem 1.25rem 1rem;
         border-bottom: 1px solid var(--border);
-      }}
-      header h1 {{
+      }
+      header h1 {
         margin: 0;
         font-size: 1.35rem;
         letter-spacing: 0.02em;
-      }}
-      header p {{
+      }
+      header p {
         margin: 0.4rem 0 0;
         color: var(--muted);
         max-width: 70ch;
         line-height: 1.5;
-      }}
-      main {{
+      }
+      main {
         padding: 1.25rem;
         max-width: 1200px;
         margin: 0 auto;
-      }}
-      .grid {{
+      }
+      .grid {
         display: grid;
         grid-template-columns: minmax(0, 1fr) minmax(320px, 420px);
         gap: 1.25rem;
         align-items: start;
-      }}
-      @media (max-width: 980px) {{
-        .grid {{ grid-template-columns: 1fr; }}
-      }}
-      .card {{
+      }
+      @media (max-width: 980px) {
+        .grid { grid-template-columns: 1fr; }
+      }
+      .card {
         background: var(--card);
         border: 1px solid var(--border);
         border-radius: 1rem;
         padding: 1rem;
         box-shadow: 0 14px 40px rgba(2, 6, 23, 0.25);
-      }}
-      .card h2 {{
+      }
+      .card h2 {
         margin: 0 0 0.75rem;
         font-size: 0.95rem;
         letter-spacing: 0.12em;
         text-transform: uppercase;
-      }}
-      label {{
+      }
+      label {
         display: block;
         font-size: 0.85rem;
         letter-spacing: 0.02em;
         margin: 0.75rem 0 0.35rem;
         color: var(--muted);
-      }}
-      input, textarea {{
+      }
+      input, textarea {
         width: 100%;
         border-radius: 0.75rem;
         border: 1px solid var(--border);
@@ -222,23 +430,23 @@ def index() -> HTMLResponse:
         color: inherit;
         padding: 0.65rem 0.75rem;
         font-size: 0.95rem;
-      }}
-      @media (prefers-color-scheme: light) {{
-        input, textarea {{ background: rgba(255,255,255,0.7); }}
-      }}
-      textarea {{ min-height: 120px; resize: vertical; }}
-      .row {{
+      }
+      @media (prefers-color-scheme: light) {
+        input, textarea { background: rgba(255,255,255,0.7); }
+      }
+      textarea { min-height: 120px; resize: vertical; }
+      .row {
         display: flex;
         gap: 0.75rem;
-      }}
-      .row > div {{ flex: 1; }}
-      .actions {{
+      }
+      .row > div { flex: 1; }
+      .actions {
         display: flex;
         gap: 0.6rem;
         margin-top: 1rem;
         flex-wrap: wrap;
-      }}
-      button {{
+      }
+      button {
         border-radius: 999px;
         border: 1px solid var(--border);
         background: rgba(15, 23, 42, 0.25);
@@ -246,41 +454,41 @@ def index() -> HTMLResponse:
         padding: 0.55rem 0.9rem;
         cursor: pointer;
         font-weight: 600;
-      }}
-      button.primary {{
+      }
+      button.primary {
         border-color: rgba(96, 165, 250, 0.55);
         background: rgba(96, 165, 250, 0.18);
-      }}
-      button.danger {{
+      }
+      button.danger {
         border-color: rgba(248, 113, 113, 0.55);
         background: rgba(248, 113, 113, 0.14);
-      }}
-      button:disabled {{
+      }
+      button:disabled {
         opacity: 0.55;
         cursor: not-allowed;
-      }}
-      table {{
+      }
+      table {
         width: 100%;
         border-collapse: collapse;
-      }}
-      th, td {{
+      }
+      th, td {
         border-bottom: 1px solid var(--border);
         padding: 0.5rem 0.35rem;
         text-align: left;
         vertical-align: top;
         font-size: 0.9rem;
-      }}
-      th {{
+      }
+      th {
         font-size: 0.78rem;
         letter-spacing: 0.12em;
         text-transform: uppercase;
         color: var(--muted);
-      }}
-      .mono {{
+      }
+      .mono {
         font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace;
         font-size: 0.86em;
-      }}
-      .pill {{
+      }
+      .pill {
         display: inline-flex;
         align-items: center;
         gap: 0.35rem;
@@ -289,18 +497,18 @@ def index() -> HTMLResponse:
         border: 1px solid var(--border);
         color: var(--muted);
         font-size: 0.75rem;
-      }}
-      .muted {{ color: var(--muted); }}
-      a {{ color: var(--accent); text-decoration: none; }}
-      a:hover {{ text-decoration: underline; }}
-      .toolbar {{
+      }
+      .muted { color: var(--muted); }
+      a { color: var(--accent); text-decoration: none; }
+      a:hover { text-decoration: underline; }
+      .toolbar {
         display: flex;
         align-items: center;
         justify-content: space-between;
         gap: 0.75rem;
         flex-wrap: wrap;
         margin-bottom: 0.75rem;
-      }}
+      }
     </style>
   </head>
   <body>
@@ -389,7 +597,7 @@ def index() -> HTMLResponse:
       const groupsEl = document.getElementById('groups');
       const coursesEl = document.getElementById('courses');
 
-      const fields = {{
+      const fields = {
         id: document.getElementById('course-id'),
         subject: document.getElementById('subject'),
         group: document.getElementById('group'),
@@ -397,19 +605,19 @@ def index() -> HTMLResponse:
         year: document.getElementById('year'),
         name: document.getElementById('name'),
         description: document.getElementById('description'),
-      }};
+      };
 
       const saveBtn = document.getElementById('save');
       const newBtn = document.getElementById('new');
       const deleteBtn = document.getElementById('delete');
 
-      let state = {{ subjects: [], courses: [] }};
+      let state = { subjects: [], courses: [] };
 
-      function setStatus(text) {{
+      function setStatus(text) {
         statusEl.textContent = text;
-      }}
+      }
 
-      function clearForm() {{
+      function clearForm() {
         fields.id.value = '';
         fields.subject.value = '';
         fields.group.value = '';
@@ -419,40 +627,40 @@ def index() -> HTMLResponse:
         fields.description.value = '';
         deleteBtn.disabled = true;
         setStatus('Ready');
-      }}
+      }
 
-      function option(value) {{
+      function option(value) {
         const opt = document.createElement('option');
         opt.value = value;
         return opt;
-      }}
+      }
 
-      function refreshDatalists() {{
+      function refreshDatalists() {
         subjectsEl.innerHTML = '';
-        for (const subj of state.subjects) {{
+        for (const subj of state.subjects) {
           subjectsEl.appendChild(option(subj.name));
-        }}
+        }
         refreshGroupDatalist();
-      }}
+      }
 
-      function refreshGroupDatalist() {{
+      function refreshGroupDatalist() {
         const selectedSubject = (fields.subject.value || '').trim();
         const subj = state.subjects.find((s) => s.name === selectedSubject);
         groupsEl.innerHTML = '';
         if (!subj) return;
-        for (const group of subj.groups) {{
+        for (const group of subj.groups) {
           groupsEl.appendChild(option(group));
-        }}
-      }}
+        }
+      }
 
-      function courseLabel(course) {{
-        const code = course.code ? `${{course.code}} · ` : '';
-        return `${{code}}${{course.name || course.id}}`;
-      }}
+      function courseLabel(course) {
+        const code = course.code ? `${course.code} · ` : '';
+        return `${code}${course.name || course.id}`;
+      }
 
-      function renderCourses() {{
+      function renderCourses() {
         coursesEl.innerHTML = '';
-        for (const course of state.courses) {{
+        for (const course of state.courses) {
           const tr = document.createElement('tr');
           const tdCourse = document.createElement('td');
           const tdSubject = document.createElement('td');
@@ -460,14 +668,14 @@ def index() -> HTMLResponse:
           const tdYear = document.createElement('td');
           const tdActions = document.createElement('td');
 
-          tdCourse.innerHTML = `<div><span class="mono">${{course.id}}</span></div><div>${{courseLabel(course)}}</div>`;
+          tdCourse.innerHTML = `<div><span class="mono">${course.id}</span></div><div>${courseLabel(course)}</div>`;
           tdSubject.textContent = course.subject || '';
           tdGroup.textContent = course.group || '';
           tdYear.textContent = course.year == null ? '' : String(course.year);
 
           const editBtn = document.createElement('button');
           editBtn.textContent = 'Edit';
-          editBtn.addEventListener('click', () => {{
+          editBtn.addEventListener('click', () => {
             fields.id.value = course.id || '';
             fields.subject.value = course.subject || '';
             fields.group.value = course.group || '';
@@ -478,7 +686,7 @@ def index() -> HTMLResponse:
             deleteBtn.disabled = !course.id;
             refreshGroupDatalist();
             setStatus('Editing');
-          }});
+          });
 
           tdActions.appendChild(editBtn);
 
@@ -488,19 +696,19 @@ def index() -> HTMLResponse:
           tr.appendChild(tdYear);
           tr.appendChild(tdActions);
           coursesEl.appendChild(tr);
-        }}
-      }}
+        }
+      }
 
-      async function loadState() {{
+      async function loadState() {
         const resp = await fetch('/api/state');
         if (!resp.ok) throw new Error('Failed to load state');
         state = await resp.json();
         refreshDatalists();
         renderCourses();
-      }}
+      }
 
-      function buildPayload() {{
-        const payload = {{
+      function buildPayload() {
+        const payload = {
           subject: (fields.subject.value || '').trim(),
           group: (fields.group.value || '').trim(),
           id: (fields.id.value || '').trim() || null,
@@ -508,75 +716,116 @@ def index() -> HTMLResponse:
           name: (fields.name.value || '').trim(),
           year: (fields.year.value || '').trim() || null,
           description: (fields.description.value || '').trim() || null,
-        }};
-        if (payload.year && /^\\d+$/.test(payload.year)) {{
+        };
+        if (payload.year && /^\\d+$/.test(payload.year)) {
           payload.year = Number(payload.year);
-        }}
+        }
         return payload;
-      }}
+      }
 
-      async function saveCourse() {{
+      async function saveCourse() {
         const payload = buildPayload();
-        if (!payload.subject || !payload.group || !payload.name) {{
+        if (!payload.subject || !payload.group || !payload.name) {
           setStatus('Subject, group, and name are required');
           return;
-        }}
+        }
         setStatus('Saving…');
-        const resp = await fetch('/api/course', {{
+        const resp = await fetch('/api/course', {
           method: 'POST',
-          headers: {{ 'content-type': 'application/json' }},
+          headers: { 'content-type': 'application/json' },
           body: JSON.stringify(payload),
-        }});
-        if (!resp.ok) {{
+        });
+        if (!resp.ok) {
           const msg = await resp.text();
-          setStatus(`Error: ${{msg}}`);
+          setStatus(`Error: ${msg}`);
           return;
-        }}
+        }
         await loadState();
         setStatus('Saved');
-        if (!fields.id.value) {{
+        if (!fields.id.value) {
           clearForm();
-        }}
-      }}
+        }
+      }
 
-      async function deleteCourse() {{
+      async function deleteCourse() {
         const id = (fields.id.value || '').trim();
         if (!id) return;
-        if (!confirm(`Delete ${{id}}?`)) return;
+        if (!confirm(`Delete ${id}?`)) return;
         setStatus('Deleting…');
-        const resp = await fetch(`/api/course/${{encodeURIComponent(id)}}`, {{ method: 'DELETE' }});
-        if (!resp.ok) {{
+        const resp = await fetch(`/api/course/${encodeURIComponent(id)}`, { method: 'DELETE' });
+        if (!resp.ok) {
           const msg = await resp.text();
-          setStatus(`Error: ${{msg}}`);
+          setStatus(`Error: ${msg}`);
           return;
-        }}
+        }
         await loadState();
         clearForm();
         setStatus('Deleted');
-      }}
+      }
 
       saveBtn.addEventListener('click', saveCourse);
       newBtn.addEventListener('click', clearForm);
       deleteBtn.addEventListener('click', deleteCourse);
       fields.subject.addEventListener('change', refreshGroupDatalist);
 
-      loadState().catch((err) => {{
+      loadState().catch((err) => {
         console.error(err);
         setStatus('Failed to load');
-      }});
+      });
     </script>
   </body>
 </html>
-""",
+""".replace("{COURSEWORK_PATH}", str(COURSEWORK_PATH))
+_INDEX_BYTES = _INDEX_HTML.encode("utf-8")
+_INDEX_GZIP = gzip.compress(_INDEX_BYTES, compresslevel=9)
+_INDEX_VARY = {"vary": "accept-encoding"}
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether gzip is acceptable per RFC 9110: an explicit ``gzip`` entry wins over ``*``."""
+    wildcard: bool | None = None
+    for entry in accept_encoding.lower().split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            return q > 0
+        wildcard = q > 0
+    return bool(wildcard)
+
+
+@app.get("/", response_class=HTMLResponse)
+def index(request: Request) -> HTMLResponse:
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(
+            content=_INDEX_GZIP,
+            media_type="text/html; charset=utf-8",
+            headers={**_INDEX_VARY, "content-encoding": "gzip"},
+        )
+    return HTMLResponse(
+        content=_INDEX_BYTES, media_type="text/html; charset=utf-8", headers=_INDEX_VARY
     )
 
 
 @app.get("/api/state")
-def api_state() -> JSONResponse:
-    data = _read_coursework()
-    hierarchy = data.get("hierarchy")
-    if not isinstance(hierarchy, dict):
-        raise HTTPException(status_code=500, detail="courses.json missing hierarchy")
+def api_state() -> Response:
+    cache = _cached_coursework()
+    if cache.state_body is None:
+        cache.state_body = _state_body(_read_view(cache.data))
+    return Response(cache.state_body, media_type="application/json")
+
+
+def _state_body(data: Mapping[str, Any]) -> bytes:
+    hierarchy = MappingProxyType(_hierarchy(data))
 
     subjects: list[dict[str, Any]] = []
     for subject in _iter_subject_nodes(hierarchy):
@@ -586,61 +835,52 @@ def api_state() -> JSONResponse:
         groups = [g.get("name") for g in _iter_group_nodes(subject) if isinstance(g.get("name"), str)]
         subjects.append({"name": name, "groups": sorted([g for g in groups if g])})
 
-    return JSONResponse({"subjects": sorted(subjects, key=lambda s: s["name"]), "courses": _flatten_courses(hierarchy)})
+    return orjson.dumps(
+        {"subjects": sorted(subjects, key=lambda s: s["name"]), "courses": _flatten_courses(hierarchy)}
+    )
 
 
 @app.post("/api/course")
-def upsert_course(payload: CoursePayload) -> dict[str, str]:
-    data = _read_coursework()
-    hierarchy = data.get("hierarchy")
-    if not isinstance(hierarchy, dict):
-        raise HTTPException(status_code=500, detail="courses.json missing hierarchy")
-
-    subject = payload.subject.strip()
-    group = payload.group.strip()
-
-    code = (payload.code or "").strip() or None
-    name = payload.name.strip()
-
-    course_id = (payload.id or "").strip() or None
+async def upsert_course(payload: CoursePayload) -> Response:
+    code = payload.code or None
+    course_id = payload.id or None
     if course_id is None:
-        course_id = code or _slug(name)
+        course_id = code or _slug(payload.name)
     if not course_id:
         raise HTTPException(status_code=400, detail="Unable to derive course id")
 
-    _remove_course_by_id(hierarchy, course_id)
-
-    subject_node = _get_or_create_subject(hierarchy, subject)
-    group_node = _get_or_create_group(subject_node, group)
-
-    course: dict[str, Any] = {"id": course_id, "code": code, "name": name}
-
-    if payload.year is not None and payload.year != "":
+    course: dict[str, Any] = {"id": course_id, "code": code, "name": payload.name}
+    if payload.year is not None:
         course["year"] = payload.year
-    if payload.description is not None and payload.description.strip():
-        course["description"] = payload.description.strip()
-    else:
-        course.pop("description", None)
+    if payload.description:
+        course["description"] = payload.description
 
-    group_node.setdefault("children", []).append(course)
-    _write_coursework(data)
-    return {"status": "ok", "id": course_id}
+    def mutate(data: dict[str, Any]) -> None:
+        hierarchy = _hierarchy(data)
+        subjects, groups, courses = _index_hierarchy(hierarchy)
+        _remove_course_by_id(courses, course_id)
+        subject_node = _get_or_create_subject(hierarchy, subjects, payload.subject)
+        group_node = _get_or_create_group(subject_node, groups, payload.subject, payload.group)
+        group_node.setdefault("children", []).append(course)
 
+    await _submit_write(mutate)
+    return _json_response({"status": "ok", "id": course_id})
 
-@app.delete("/api/course/{course_id}")
-def delete_course(course_id: str) -> dict[str, str]:
-    data = _read_coursework()
-    hierarchy = data.get("hierarchy")
-    if not isinstance(hierarchy, dict):
-        raise HTTPException(status_code=500, detail="courses.json missing hierarchy")
-    course_id = course_id.strip()
+
+async def delete_course(request: Request) -> Response:
+    course_id = request.path_params["course_id"].strip()
     if not course_id:
         raise HTTPException(status_code=400, detail="Missing id")
 
-    before = len(_flatten_courses(hierarchy))
-    _remove_course_by_id(hierarchy, course_id)
-    after = len(_flatten_courses(hierarchy))
-    _write_coursework(data)
-    if before == after:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return {"status": "ok"}
+    def mutate(data: dict[str, Any]) -> None:
+        _, _, courses = _index_hierarchy(_hierarchy(data))
+        if not _remove_course_by_id(courses, course_id):
+            raise HTTPException(status_code=404, detail="Course not found")
+
+    await _submit_write(mutate)
+    return _json_response({"status": "ok"})
+
+
+# Plain Starlette route: a single string path param doesn't need FastAPI's dependency/validation
+# machinery. HTTPException is still rendered by the app's exception handlers.
+app.add_route("/api/course/{course_id}", delete_course, methods=["DELETE"])
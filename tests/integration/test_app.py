@@ -79,3 +79,25 @@ def test_llms_txt():
     assert r.status_code == 200
     assert "https://gunayintheory.com/coursework" in r.text
     assert "https://gunayintheory.com/blog" not in r.text
+
+
+def test_rss_feed_honours_if_none_match():
+    first = client.get("/feed.xml")
+    etag = first.headers["etag"]
+    assert etag
+
+    r = client.get("/feed.xml", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert client.get("/feed.xml").content == first.content
+
+
+def test_startup_survives_failed_cache_warm_up(monkeypatch):
+    import app.main as main
+
+    def broken(**_: object) -> None:
+        raise ValueError("bad post")
+
+    monkeypatch.setattr(main, "list_posts", broken)
+    with TestClient(app) as warm_client:
+        assert warm_client.get("/healthz").status_code == 200
@@ -16,3 +16,100 @@ def test_get_post_by_slug():
     assert "Hello, World" in post.content
     assert post.canonical_path == "/blog/hello-world"
     assert post.status == "published"
+
+
+def test_load_post_matches_delimiter_lines_like_python_frontmatter(tmp_path):
+    from app.services.content import _load_post
+
+    path = tmp_path / "spaced" / "index.md"
+    path.parent.mkdir()
+    path.write_text(
+        "---\ntitle: T\ndate: 2024-01-01\n--- \nIntro\n\n---\n\nMore: text\n", encoding="utf-8"
+    )
+
+    post = _load_post(path)
+    assert post is not None
+    assert post.title == "T"
+    assert post.content.strip() == "Intro\n\n---\n\nMore: text"
+
+
+def test_load_post_is_cached_until_file_changes(tmp_path):
+    from app.services.content import _load_post, reload_posts
+
+    path = tmp_path / "cached" / "index.md"
+    path.parent.mkdir()
+    path.write_text("---\ntitle: First\ndate: 2024-01-01\n---\nBody\n", encoding="utf-8")
+
+    first = _load_post(path)
+    assert first is not None
+    assert _load_post(path) is first
+
+    path.write_text("---\ntitle: Second title\ndate: 2024-01-01\n---\nBody\n", encoding="utf-8")
+    second = _load_post(path)
+    assert second is not None
+    assert second is not first
+    assert second.title == "Second title"
+
+    reload_posts()
+    assert _load_post(path) is not second
+
+
+def test_list_posts_index_tracks_new_and_edited_posts(tmp_path, monkeypatch):
+    from app.services import content
+
+    monkeypatch.setattr(content, "CONTENT_DIR", tmp_path)
+    content.reload_posts()
+
+    def write(slug: str, date: str) -> None:
+        path = tmp_path / slug / "index.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"---\ntitle: {slug}\ndate: {date}\n---\nBody\n", encoding="utf-8")
+
+    write("older", "2024-01-01")
+    assert [p.slug for p in content.list_posts()] == ["older"]
+
+    write("newer", "2024-02-01")
+    assert [p.slug for p in content.list_posts()] == ["newer", "older"]
+
+    write("older", "2024-03-01T00:00:00")
+    assert [p.slug for p in content.list_posts()] == ["older", "newer"]
+    content.reload_posts()
+
+
+def test_list_posts_by_year_groups_newest_first(tmp_path, monkeypatch):
+    from app.services import content
+
+    monkeypatch.setattr(content, "CONTENT_DIR", tmp_path)
+    content.reload_posts()
+    for slug, date in (("a", "2023-05-01"), ("b", "2024-01-01"), ("c", "2024-06-01")):
+        path = tmp_path / slug / "index.md"
+        path.parent.mkdir()
+        path.write_text(f"---\ntitle: {slug}\ndate: {date}\n---\nBody\n", encoding="utf-8")
+
+    by_year = [(year, [p.slug for p in posts]) for year, posts in content.list_posts_by_year()]
+    assert by_year == [(2024, ["c", "b"]), (2023, ["a"])]
+    content.reload_posts()
+
+
+def test_get_page_is_cached_and_escapes_meta_once(tmp_path, monkeypatch):
+    from app.services import content
+
+    monkeypatch.setattr(content, "PAGES_DIR", tmp_path)
+    path = tmp_path / "about.md"
+    path.write_text(
+        '---\ntitle: About\nlocation: "A & B"\nhero_title: 2024-01-02\nquotes: ["<q>"]\n'
+        "links:\n  - {label: GH, url: 'https://x?a=1&b=2'}\n  - {label: no-url}\n---\nBody\n"
+    )
+
+    page = content.get_page("about")
+    assert page is not None
+    assert content.get_page("about") is page
+    assert page.meta_escaped["location"] == "A &amp; B"
+    assert page.meta_escaped["hero_title"] == "2024-01-02"
+    assert page.quotes_escaped == ["&lt;q&gt;"]
+    assert page.quotes_escaped is page.quotes_escaped
+    assert page.links_prebuilt == ['<li><a href="https://x?a=1&amp;b=2">GH</a></li>']
+
+    path.write_text("---\ntitle: About again\n---\nBody\n")
+    assert content.get_page("about") is not page
+    content.reload_posts()
@@ -0,0 +1,106 @@
+import copy
+import json
+
+from starlette.testclient import TestClient
+
+from scripts import coursework_editor
+
+
+def _client(monkeypatch, tmp_path):
+    path = tmp_path / "courses.json"
+    hierarchy = {
+        "children": [
+            {
+                "name": "Math",
+                "children": [{"name": "Core", "children": [{"id": "MA 101", "name": "Calculus"}]}],
+            }
+        ]
+    }
+    path.write_text(json.dumps({"hierarchy": hierarchy}), encoding="utf-8")
+    monkeypatch.setattr(coursework_editor, "COURSEWORK_PATH", path)
+    monkeypatch.setattr(coursework_editor, "_CACHE", None)
+    return TestClient(coursework_editor.app)
+
+
+def test_api_state_reads_the_shared_parse_without_mutating_it(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    first = client.get("/api/state")
+    cache = coursework_editor._CACHE
+    assert cache is not None
+    snapshot = copy.deepcopy(cache.data)
+
+    second = client.get("/api/state")
+    assert coursework_editor._CACHE is cache
+    assert cache.data == snapshot
+    assert second.content == first.content
+    assert [c["id"] for c in first.json()["courses"]] == ["MA 101"]
+
+
+def test_writes_do_not_leak_into_the_cached_read_view(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    client.get("/api/state")
+    before = coursework_editor._CACHE
+    assert before is not None
+    snapshot = copy.deepcopy(before.data)
+
+    r = client.post("/api/course", json={"subject": " Math ", "group": "Core", "name": "Algebra"})
+    assert r.json() == {"status": "ok", "id": "algebra"}
+    assert before.data == snapshot
+    courses = client.get("/api/state").json()["courses"]
+    assert [c["id"] for c in courses] == ["algebra", "MA 101"]
+
+    assert client.delete("/api/course/MA%20101").status_code == 200
+    assert client.delete("/api/course/MA%20101").status_code == 404
+    on_disk = json.loads((tmp_path / "courses.json").read_text(encoding="utf-8"))
+    assert on_disk == coursework_editor._CACHE.data
+
+
+async def test_writes_within_the_window_share_one_flush(monkeypatch, tmp_path):
+    import asyncio
+
+    from fastapi import HTTPException
+
+    _client(monkeypatch, tmp_path)
+    flushes: list[int] = []
+    write = coursework_editor._write_coursework
+    monkeypatch.setattr(
+        coursework_editor, "_write_coursework", lambda data: (flushes.append(1), write(data))
+    )
+
+    def add(course_id):
+        def mutate(data):
+            group = data["hierarchy"]["children"][0]["children"][0]
+            group["children"].append({"id": course_id, "name": course_id})
+            return course_id
+
+        return mutate
+
+    def missing(data):
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    results = await asyncio.gather(
+        coursework_editor._submit_write(add("a")),
+        coursework_editor._submit_write(missing),
+        coursework_editor._submit_write(add("b")),
+        return_exceptions=True,
+    )
+    assert results[0] == "a" and results[2] == "b"
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 404
+    assert flushes == [1]
+    on_disk = json.loads((tmp_path / "courses.json").read_text(encoding="utf-8"))
+    ids = [c["id"] for c in on_disk["hierarchy"]["children"][0]["children"][0]["children"]]
+    assert ids == ["MA 101", "a", "b"]
+
+
+def test_index_serves_gzip_only_when_accepted(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+
+    r = client.get("/", headers={"accept-encoding": "br, gzip;q=0.5"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "accept-encoding"
+    assert r.content == coursework_editor._INDEX_BYTES
+
+    r = client.get("/", headers={"accept-encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in r.headers
+    assert r.headers["vary"] == "accept-encoding"
+    assert r.content == coursework_editor._INDEX_BYTES
@@ -33,3 +33,157 @@ def test_rewrite_html_leaves_marimo_theme_alone_without_theme_override():
     out = _rewrite_html(_SAMPLE_MARIMO_HTML, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT).decode()
     assert '"theme": "light"' in out
     assert "&quot;theme&quot;:&quot;light&quot;" in out
+
+
+def test_rewrite_html_themes_markers_regardless_of_case():
+    html = (
+        b'<html><head><script>window.__marimo_mount_config__ = {"theme": "light"};</script>'
+        b"</head><body></body></html>"
+    )
+    out = _rewrite_html(html, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT, theme="dark").decode()
+    assert '"theme": "dark"' in out
+
+
+def test_rewrite_html_keeps_existing_base_tag_regardless_of_case():
+    html = b'<html><HEAD><BASE href="/other/" /></HEAD><body></body></html>'
+    out = _rewrite_html(html, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT).decode()
+    assert "<base" not in out
+    assert out.count("/other/") == 1
+
+
+def test_rewrite_html_only_skips_paths_already_under_the_mount():
+    mount = MARIMO_SEMANTIC_ENTROPY_MOUNT
+    html = f'<a href="{mount}"></a><a href="{mount}/x"></a><a href="{mount}-old/x"></a>'
+    out = _rewrite_html(html.encode(), mount=mount).decode()
+    assert f'href="{mount}"' in out
+    assert f'href="{mount}/x"' in out
+    assert f'href="{mount}/{mount.lstrip("/")}-old/x"' in out
+
+
+def test_rewrite_html_preserves_non_utf8_bytes():
+    html = b'<html><head></head><body><a href="/x">caf\xe9</a></body></html>'
+    out = _rewrite_html(html, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT)
+    assert b'href="/marimo/semantic-entropy-probe-comparison/x">caf\xe9</a>' in out
+
+
+def _proxy_client(monkeypatch, handler):
+    import httpx
+    from fastapi import FastAPI, Request
+    from starlette.testclient import TestClient
+
+    from app.services import marimo_proxy
+
+    monkeypatch.setattr(
+        marimo_proxy, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    app = FastAPI()
+
+    @app.api_route("/marimo/{path:path}", methods=["GET", "POST"])
+    async def proxy(request: Request, path: str):
+        return await marimo_proxy.proxy_marimo_http(
+            request, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT, path=path
+        )
+
+    return TestClient(app)
+
+
+def test_proxy_streams_non_html_with_original_framing(monkeypatch):
+    import httpx
+
+    class _Chunks(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"console."
+            yield b"log(1);"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": "text/javascript", "content-length": "15"}
+        return httpx.Response(200, stream=_Chunks(), headers=headers)
+
+    client = _proxy_client(monkeypatch, handler)
+    r = client.get("/marimo/assets/app.js")
+    assert r.status_code == 200
+    assert r.content == b"console.log(1);"
+    assert r.headers["content-length"] == str(len(b"console.log(1);"))
+    assert r.headers["x-robots-tag"] == "noindex"
+
+
+def test_proxy_rewrites_html_responses(monkeypatch):
+    import httpx
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=_SAMPLE_MARIMO_HTML, headers={"content-type": "text/html; charset=utf-8"}
+        )
+
+    client = _proxy_client(monkeypatch, handler)
+    r = client.get("/marimo/", cookies={"theme": "dark"})
+    assert r.status_code == 200
+    assert '<base href="/marimo/semantic-entropy-probe-comparison/" />' in r.text
+    assert "Cookie" in r.headers["vary"]
+
+
+def test_rewrite_html_returns_body_untouched_without_markers():
+    body = b'{"cells": [], "note": "\xff not utf-8"}'
+    assert _rewrite_html(body, mount=MARIMO_SEMANTIC_ENTROPY_MOUNT, theme="dark") is body
+
+
+def test_proxy_forwards_raw_query_string(monkeypatch):
+    import httpx
+
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, html="<p>ok</p>")
+
+    client = _proxy_client(monkeypatch, handler)
+    client.get("/marimo/api/status?a=1&b=%20x")
+    assert seen and seen[0].endswith("/api/status?a=1&b=%20x")
+
+
+async def test_proxy_percent_encodes_raw_utf8_query_bytes(monkeypatch):
+    import httpx
+    from fastapi import Request
+
+    from app.services import marimo_proxy
+
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, html="<p>ok</p>")
+
+    monkeypatch.setattr(
+        marimo_proxy, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    # Raw bytes as a server would put them in the ASGI scope, without client-side escaping.
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/marimo/api/status",
+        "query_string": b"q=\xc3\xa9&b=%20x",
+        "headers": [],
+    }
+    await marimo_proxy.proxy_marimo_http(
+        Request(scope), mount=MARIMO_SEMANTIC_ENTROPY_MOUNT, path="api/status"
+    )
+    assert seen and seen[0].endswith("/api/status?q=%C3%A9&b=%20x")
+
+
+def test_proxy_forwards_request_bodies_with_content_length(monkeypatch):
+    import httpx
+
+    seen: list[tuple[str | None, str | None, bytes]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        headers = request.headers
+        seen.append((headers.get("content-length"), headers.get("transfer-encoding"), body))
+        return httpx.Response(200, html="<p>ok</p>")
+
+    client = _proxy_client(monkeypatch, handler)
+    small = b'{"cell": 1}'
+    large = b"x" * (128 * 1024)
+    client.post("/marimo/api/run", content=small)
+    client.post("/marimo/api/upload", content=large)
+    assert seen == [(str(len(small)), None, small), (str(len(large)), None, large)]
@@ -0,0 +1,13 @@
+from app.views.pages import render_coursework_page, render_home_page
+
+
+def test_theme_toggle_next_is_percent_encoded():
+    html = render_home_page([], current_path="/blog/a b?x=1&y=<2>")
+    assert 'href="/toggle-theme?next=/blog/a%20b%3Fx%3D1%26y%3D%3C2%3E"' in html
+    assert '<a href="/blog" aria-current="page">Blog</a>' in html
+
+
+def test_theme_toggle_next_keeps_plain_paths_readable():
+    html = render_coursework_page(current_path="/coursework")
+    assert 'href="/toggle-theme?next=/coursework"' in html
+    assert '<a href="/coursework" aria-current="page">Coursework</a>' in html